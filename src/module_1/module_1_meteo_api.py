@@ -1,10 +1,33 @@
 import requests
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import random
+import threading
 import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 
 logging.basicConfig(
@@ -29,20 +52,185 @@ COORDINATES = {
 
 VARIABLES = ["temperature_2m_mean", "precipitation_sum", "wind_speed_10m_max"]
 
+MAX_CONCURRENT_REQUESTS = 4
+
+CHUNK_FREQUENCY = "YS"
+
+CACHE_DIR = "src/module_1/.meteo_cache"
+
+CACHE_TTL_SECONDS = None
+
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+HISTORY_DIR = "src/module_1/meteo_history"
+
+PLOTS_DIR = "src/module_1/climate_evolution"
+
+REQUESTS_PER_SECOND = 5
+
+REQUESTS_BURST = 10
+
+BACKOFF_JITTER = 0.5
+
+PERIOD_COLUMNS = {"W": "week", "M": "month", "Q": "quarter"}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second.
+
+    acquire blocks until a token is available, so every caller sharing the
+    bucket is limited to `rate` requests per second with bursts of up to
+    `capacity`. pause stops handing out tokens, e.g. after a 429.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - max(self.updated_at, self.paused_until)
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def acquire(self) -> None:
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(
+                    self.paused_until - now, (1 - self.tokens) / self.rate
+                )
+                self.condition.wait(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = 0.0
+            self.paused_until = max(self.paused_until, now + seconds)
+
+
+class RequestCounters:
+    """Thread-safe counters of requests, retries and throttled responses."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def increase(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+    def get(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counts)
+
+
+rate_limiter = TokenBucket(REQUESTS_PER_SECOND, REQUESTS_BURST)
+
+request_counters = RequestCounters()
+
+
+class ResponseCache:
+    """On-disk cache of API responses, one JSON file per key.
+
+    Entries older than ttl_seconds are treated as missing (None keeps them
+    forever) and the least recently used files are removed once the
+    directory grows over max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        ttl_seconds: Optional[float] = CACHE_TTL_SECONDS,
+        max_bytes: Optional[int] = CACHE_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            modified_at = os.path.getmtime(path)
+            if (
+                not allow_expired
+                and self.ttl_seconds is not None
+                and time.time() - modified_at > self.ttl_seconds
+            ):
+                return None
+            with open(path) as f:
+                data = json.load(f)
+            os.utime(path, (time.time(), modified_at))
+        except (OSError, ValueError):
+            return None
+
+        return data
+
+    def set(self, key: str, data: Dict) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+
+        with self.lock:
+            entries = [
+                entry for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            ]
+            stats = {entry.path: entry.stat() for entry in entries}
+            total_bytes = sum(stat.st_size for stat in stats.values())
+
+            for path in sorted(stats, key=lambda path: stats[path].st_atime):
+                if total_bytes <= self.max_bytes:
+                    break
+                os.remove(path)
+                total_bytes -= stats[path].st_size
+
 
 def make_api_call_with_cool_off(
     url: str,
     headers: Dict[str, any],
     payload: Dict[str, any] = None,
     num_attempts: int = 3,
-    cool_off: int = 1
+    cool_off: int = 1,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[TokenBucket] = None,
+    jitter: float = 0.0
 ) -> Dict:
+    client = session if session is not None else requests
+
     for i in range(num_attempts):
+        wait = get_backoff(cool_off, jitter)
+
         try:
+            if limiter is not None:
+                limiter.acquire()
+            request_counters.increase("requests")
+
             if payload:
-                response = requests.post(url, headers=headers, json=payload)
+                response = client.post(url, headers=headers, json=payload)
             else:
-                response = requests.get(url, headers=headers)
+                response = client.get(url, headers=headers)
 
             response.raise_for_status()
 
@@ -52,7 +240,7 @@ def make_api_call_with_cool_off(
             if cool_off < num_attempts:
                 logger.warning(
                     f"Connection error: {conn_err}. "
-                    f"Waiting {cool_off} seconds"
+                    f"Waiting {wait} seconds"
                 )
             else:
                 raise requests.exceptions.ConnectionError(conn_err)
@@ -62,8 +250,16 @@ def make_api_call_with_cool_off(
                 logger.error("Error 404 Not Found")
                 raise requests.exceptions.HTTPError(http_err)
 
+            if response.status_code == 429:
+                request_counters.increase("throttles")
+                retry_after = get_retry_after(response)
+                if retry_after is not None:
+                    wait = max(wait, retry_after)
+                if limiter is not None:
+                    limiter.pause(wait)
+
             if cool_off < num_attempts:
-                logger.warning(f"HTTP error: {http_err}. Waiting {cool_off} seconds")
+                logger.warning(f"HTTP error: {http_err}. Waiting {wait} seconds")
             else:
                 raise requests.exceptions.HTTPError(http_err)
 
@@ -71,17 +267,83 @@ def make_api_call_with_cool_off(
             if cool_off < num_attempts:
                 logger.warning(
                     f"Request error: {req_err}. "
-                    f"Waiting {cool_off} seconds"
+                    f"Waiting {wait} seconds"
                 )
             else:
                 raise requests.exceptions.RequestException(req_err)
 
-        time.sleep(cool_off)
+        request_counters.increase("retries")
+        time.sleep(wait)
         cool_off = cool_off * 2
 
 
-def get_data_meteo(
-        latitude: float, longitude: float, start_date: str, end_date: str
+def get_backoff(cool_off: float, jitter: float = 0.0) -> float:
+    """Spreads the cool-off uniformly over cool_off * [1 - jitter, 1 + jitter]
+    so that clients failing together do not retry together.
+    """
+    if not jitter:
+        return cool_off
+    return round(cool_off * random.uniform(1 - jitter, 1 + jitter), 3)
+
+
+def get_retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait according to the Retry-After header, which holds either
+    a number of seconds or an HTTP date."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def split_date_range(
+    start_date: str, end_date: str, frequency: str = CHUNK_FREQUENCY
+) -> List[Tuple[str, str]]:
+    """Splits [start_date, end_date] into consecutive chunks that start at each
+    period boundary of the pandas frequency (e.g. "YS" for one chunk per year).
+    """
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    boundaries = pd.date_range(start, end, freq=frequency)
+    chunk_starts = [start] + [b for b in boundaries if b > start]
+    chunk_ends = [b - pd.Timedelta(days=1) for b in chunk_starts[1:]] + [end]
+
+    return [
+        (chunk_start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d"))
+        for chunk_start, chunk_end in zip(chunk_starts, chunk_ends)
+    ]
+
+
+def get_cache_key(
+    latitude: float, longitude: float, start_date: str, end_date: str
+) -> str:
+    key = json.dumps([latitude, longitude, VARIABLES, start_date, end_date])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def merge_chunks(chunks: List[Dict]) -> Dict:
+    merged = dict(chunks[0])
+    merged["daily"] = {
+        column: [value for chunk in chunks for value in chunk["daily"][column]]
+        for column in chunks[0]["daily"]
+    }
+    return merged
+
+
+def get_data_meteo_chunk(
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str,
+        session: Optional[requests.Session] = None
 ) -> Dict:
     headers = {}
     params = {
@@ -92,42 +354,277 @@ def get_data_meteo(
         "daily": ",".join(VARIABLES),
     }
 
-    return make_api_call_with_cool_off(API_URL + urlencode(params, safe=","), headers)
-
+    return make_api_call_with_cool_off(
+        API_URL + urlencode(params, safe=","),
+        headers,
+        session=session,
+        limiter=rate_limiter,
+        jitter=BACKOFF_JITTER,
+    )
 
-def get_processed_df_by_month(data: pd.DataFrame) -> pd.DataFrame:
-    data["time"] = pd.to_datetime(data["time"])
 
-    grouped_data = data.groupby([data["city"], data["time"].dt.to_period("M")])
+def get_data_meteo(
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        chunk_frequency: str = CHUNK_FREQUENCY
+) -> Dict:
+    """Downloads the date range chunk by chunk, only calling the API for the
+    chunks missing from the cache. An expired chunk is still used if the API
+    cannot be reached.
+    """
+    chunks = []
+
+    for chunk_start, chunk_end in split_date_range(
+        start_date, end_date, chunk_frequency
+    ):
+        key = get_cache_key(latitude, longitude, chunk_start, chunk_end)
+        chunk = cache.get(key) if cache else None
+
+        if chunk is None:
+            try:
+                chunk = get_data_meteo_chunk(
+                    latitude, longitude, chunk_start, chunk_end, session
+                )
+            except requests.exceptions.RequestException:
+                chunk = cache.get(key, allow_expired=True) if cache else None
+                if chunk is None:
+                    raise
+                logger.warning(
+                    f"Using expired cache for {chunk_start} - {chunk_end}"
+                )
+            else:
+                if cache:
+                    cache.set(key, chunk)
+
+        chunks.append(chunk)
+
+    return merge_chunks(chunks)
+
+
+def create_session(
+    max_connections: int = MAX_CONCURRENT_REQUESTS
+) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def iter_data_meteo_for_cities(
+    coordinates: Dict[str, Dict[str, float]],
+    start_date: str,
+    end_date: str,
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    cache: Optional[ResponseCache] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """Downloads the data of every city in parallel over a shared connection pool
+    and yields (city, data) as each download finishes.
+
+    At most max_concurrent_requests calls are in flight at once, and each one
+    keeps the retries and cool-off of make_api_call_with_cool_off. A new city
+    is only submitted once a finished one has been consumed, so no more than
+    max_concurrent_requests responses are held in memory.
+    """
+    cities = iter(coordinates.items())
+
+    with (
+        create_session(max_concurrent_requests) as session,
+        ThreadPoolExecutor(max_workers=max_concurrent_requests) as executor
+    ):
+        def submit(city: str, city_coordinates: Dict[str, float]) -> Future:
+            future = executor.submit(
+                get_data_meteo,
+                city_coordinates["latitude"],
+                city_coordinates["longitude"],
+                start_date,
+                end_date,
+                session,
+                cache,
+            )
+            pending[future] = city
+            return future
+
+        pending = {}
+        for city, city_coordinates in islice(cities, max_concurrent_requests):
+            submit(city, city_coordinates)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                city = pending.pop(future)
+                yield city, future.result()
+
+                next_city = next(cities, None)
+                if next_city is not None:
+                    submit(*next_city)
+
+
+def get_data_meteo_for_cities(
+    coordinates: Dict[str, Dict[str, float]],
+    start_date: str,
+    end_date: str,
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    cache: Optional[ResponseCache] = None
+) -> Dict[str, Dict]:
+    return dict(
+        iter_data_meteo_for_cities(
+            coordinates, start_date, end_date, max_concurrent_requests, cache
+        )
+    )
+
+
+def write_city_partitions(
+    city: str, data: Dict, path: str = HISTORY_DIR
+) -> None:
+    """Writes the daily data of a city as Parquet partitions city=/year=,
+    replacing the partitions it already had."""
+    daily = pd.DataFrame(data["daily"])
+    time_ = pd.to_datetime(daily["time"])
+    table = pa.table(
+        {
+            "city": pa.array([city] * len(daily), pa.string()),
+            "year": pa.array(time_.dt.year, pa.int16()),
+            "time": pa.array(time_.dt.date, pa.date32()),
+            **{
+                variable: pa.array(daily[variable], pa.float64(), from_pandas=True)
+                for variable in VARIABLES
+            },
+        }
+    )
+    pq.write_to_dataset(
+        table,
+        path,
+        partition_cols=["city", "year"],
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+
+
+def stream_data_meteo_to_parquet(
+    coordinates: Dict[str, Dict[str, float]],
+    start_date: str,
+    end_date: str,
+    path: str = HISTORY_DIR,
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    cache: Optional[ResponseCache] = None
+) -> None:
+    for city, data in iter_data_meteo_for_cities(
+        coordinates, start_date, end_date, max_concurrent_requests, cache
+    ):
+        write_city_partitions(city, data, path)
+        logger.info(f"{city} written to {path}")
+
+
+def get_processed_df_from_parquet(
+    path: str = HISTORY_DIR, frequency: str = "M"
+) -> pd.DataFrame:
+    """Aggregates the history written by stream_data_meteo_to_parquet one city
+    at a time, so only one city's daily data is in memory at once."""
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    cities = sorted({
+        ds.get_partition_keys(fragment.partition_expression)["city"]
+        for fragment in dataset.get_fragments()
+    })
 
     processed_data = []
+    for city in cities:
+        city_data = (
+            dataset.to_table(
+                columns=["time", *VARIABLES], filter=pc.field("city") == city
+            )
+            .to_pandas(date_as_object=False)
+            .assign(city=city)
+        )
+        processed_data.append(get_processed_df_by_period(city_data, frequency))
 
-    for (city, month), group in grouped_data:
-        monthly_data_per_city = {"city": city, "month": month.to_timestamp()}
+    return pd.concat(processed_data, ignore_index=True)
 
-        for variable in VARIABLES:
-            monthly_data_per_city[f"{variable}_max"] = group[variable].max()
-            monthly_data_per_city[f"{variable}_min"] = group[variable].min()
-            monthly_data_per_city[f"{variable}_mean"] = group[variable].mean()
-            monthly_data_per_city[f"{variable}_std"] = group[variable].std()
 
-        processed_data.append(monthly_data_per_city)
+def get_processed_df_by_period(
+    data: pd.DataFrame, frequency: str = "M"
+) -> pd.DataFrame:
+    """Max, min, mean and std of every variable per city and period.
 
-    return pd.DataFrame(processed_data)
+    frequency is a pandas period alias ("W", "M", "Q", ...) and names the
+    period column through PERIOD_COLUMNS. All the statistics are computed in
+    a single grouped aggregation.
+    """
+    periods = (
+        pd.to_datetime(data["time"])
+        .dt.to_period(frequency)
+        .dt.to_timestamp()
+        .rename(PERIOD_COLUMNS.get(frequency, "period"))
+    )
 
+    processed_data = data.groupby([data["city"], periods])[VARIABLES].agg(
+        ["max", "min", "mean", "std"]
+    )
+    processed_data.columns = [
+        f"{variable}_{statistic}" for variable, statistic in processed_data.columns
+    ]
 
-def plot_df(processed_df: pd.DataFrame):
-    rows = len(VARIABLES)
-    cols = len(processed_df["city"].unique())
-    fig, axs = plt.subplots(rows, cols, figsize=(10, 6 * rows))
+    return processed_data.reset_index()
 
-    for i, variable in enumerate(VARIABLES):
-        for k, city in enumerate(processed_df["city"].unique()):
-            city_data = processed_df[processed_df["city"] == city]
 
+def get_processed_df_by_month(data: pd.DataFrame) -> pd.DataFrame:
+    return get_processed_df_by_period(data, "M")
+
+
+def downsample(
+    city_data: pd.DataFrame, max_points: int, period_column: str = "month"
+) -> pd.DataFrame:
+    """Merges consecutive periods into at most max_points buckets, keeping the
+    envelope: max of the maxima, min of the minima and mean of means and stds.
+    """
+    if len(city_data) <= max_points:
+        return city_data
+
+    buckets = np.arange(len(city_data)) * max_points // len(city_data)
+    aggregations = {period_column: "first"}
+    for column in city_data.columns:
+        for statistic in ["max", "min", "mean", "std"]:
+            if column.endswith(f"_{statistic}"):
+                aggregations[column] = "mean" if statistic == "std" else statistic
+
+    return (
+        city_data.groupby(buckets)
+        .agg(aggregations)
+        .assign(city=city_data["city"].iloc[0])
+        .loc[:, city_data.columns]
+    )
+
+
+def plot_figure(
+    processed_df: pd.DataFrame,
+    variables: List[str],
+    output_file: str,
+    max_points: Optional[int] = None,
+    period_column: str = "month"
+) -> float:
+    """Draws variables (rows) x cities (columns) into output_file with the Agg
+    canvas, without going through pyplot, and returns the seconds it took."""
+    start = time.perf_counter()
+    cities = processed_df["city"].unique()
+    rows = len(variables)
+    cols = len(cities)
+    fig = Figure(figsize=(10, 6 * rows))
+    FigureCanvasAgg(fig)
+    axs = fig.subplots(rows, cols, squeeze=False)
+
+    for k, city in enumerate(cities):
+        city_data = processed_df[processed_df["city"] == city]
+        if max_points is not None:
+            city_data = downsample(city_data, max_points, period_column)
+
+        for i, variable in enumerate(variables):
             # Plot mean values
             axs[i, k].plot(
-                city_data["month"],
+                city_data[period_column],
                 city_data[f"{variable}_mean"],
                 label=f"{city} (mean)",
                 color=f"C{k}",
@@ -135,7 +632,7 @@ def plot_df(processed_df: pd.DataFrame):
 
             # Plot max and min as shaded area
             axs[i, k].fill_between(
-                city_data["month"],
+                city_data[period_column],
                 city_data[f"{variable}_min"],
                 city_data[f"{variable}_max"],
                 alpha=0.2,
@@ -144,7 +641,7 @@ def plot_df(processed_df: pd.DataFrame):
 
             # Plot std as error bars (optional, can be commented out if too noisy)
             axs[i, k].errorbar(
-                city_data["month"],
+                city_data[period_column],
                 city_data[f"{variable}_mean"],
                 yerr=city_data[f"{variable}_std"],
                 fmt="none",
@@ -160,30 +657,78 @@ def plot_df(processed_df: pd.DataFrame):
 
             axs[i, k].legend()
 
-    plt.tight_layout()
-    plt.savefig("src/module_1/climate_evolution.png", bbox_inches="tight")
+    fig.tight_layout()
+    fig.savefig(output_file, bbox_inches="tight")
+
+    return time.perf_counter() - start
+
+
+def plot_df(processed_df: pd.DataFrame):
+    plot_figure(processed_df, VARIABLES, "src/module_1/climate_evolution.png")
+
+
+def plot_df_parallel(
+    processed_df: pd.DataFrame,
+    output_dir: str = PLOTS_DIR,
+    by: str = "variable",
+    max_workers: Optional[int] = None,
+    max_points: Optional[int] = None,
+    period_column: str = "month"
+) -> List[str]:
+    """Renders one figure per variable (all cities) or per city (all variables)
+    in a process pool and returns the written files.
+
+    Workers are spawned rather than forked because the parent may already run
+    threads (the download pool, Arrow), which fork does not copy safely.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if by == "variable":
+        figures = {
+            variable: (processed_df, [variable]) for variable in VARIABLES
+        }
+    elif by == "city":
+        figures = {
+            city: (city_data, VARIABLES)
+            for city, city_data in processed_df.groupby("city", sort=False)
+        }
+    else:
+        raise ValueError(f"by must be 'variable' or 'city', got {by}")
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            os.path.join(output_dir, f"{name}.png"): executor.submit(
+                plot_figure,
+                figure_df,
+                variables,
+                os.path.join(output_dir, f"{name}.png"),
+                max_points,
+                period_column,
+            )
+            for name, (figure_df, variables) in figures.items()
+        }
+
+        for output_file, future in futures.items():
+            logger.info(f"{output_file} rendered in {future.result():.2f} seconds")
+
+    return list(futures)
 
 
 def main():
-    cities_df_list = []
     start_date = "2010-01-01"
     end_date = "2020-12-31"
 
-    for city, coordinates in COORDINATES.items():
-        latitude = coordinates["latitude"]
-        longitude = coordinates["longitude"]
-
-        city_df = pd.DataFrame(
-            get_data_meteo(latitude, longitude, start_date, end_date)["daily"]
-        ).assign(city=city)
-
-        cities_df_list.append(city_df)
+    stream_data_meteo_to_parquet(
+        COORDINATES, start_date, end_date, cache=ResponseCache()
+    )
 
-    cities_df = pd.concat(cities_df_list)
+    logger.info(f"API calls: {request_counters.get()}")
 
-    processed_df = get_processed_df_by_month(cities_df)
+    processed_df = get_processed_df_from_parquet()
 
-    plot_df(processed_df)
+    plot_df_parallel(processed_df)
 
 
 if __name__ == "__main__":
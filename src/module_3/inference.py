@@ -1,9 +1,11 @@
 import os
 import logging
+from datetime import datetime
 from joblib import load
-from module_3.train import OUTPUT_PATH, evaluate_model, feature_label_split
+from module_3.metrics import MetricsAccumulator
+from module_3.train import OUTPUT_PATH, feature_label_split, log_metrics
 from module_3.utils import (
-    build_feature_frame, save_predictions, get_numerical_cols, get_feature_cols,
+    iter_feature_frame, save_predictions, get_numerical_cols, get_feature_cols,
     BINARY_COLS, CATEGORICAL_COLS 
 )
 
@@ -19,19 +21,25 @@ def main():
     model = load(os.path.join(OUTPUT_PATH, model_name))
     logger.info(f"Loaded model {model_name}")
 
-    df = build_feature_frame()
+    date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    metrics = MetricsAccumulator()
 
-    numerical_cols = get_numerical_cols(df)
+    mode = "w"
+    for df in iter_feature_frame(list(model.feature_names_in_)):
+        numerical_cols = get_numerical_cols(df)
 
-    feature_cols = get_feature_cols(numerical_cols, BINARY_COLS, CATEGORICAL_COLS)
+        feature_cols = get_feature_cols(numerical_cols, BINARY_COLS, CATEGORICAL_COLS)
 
-    X, y = feature_label_split(df, feature_cols)
+        X, y = feature_label_split(df, feature_cols)
 
-    y_pred = model.predict_proba(X)[:, 1]
+        y_pred = model.predict_proba(X)[:, 1]
 
-    evaluate_model("Inference test", y, y_pred)
+        save_predictions(y, y_pred, model_name, df, date, mode=mode)
+        mode = "a"
 
-    save_predictions(y, y_pred, model_name, df)
+        metrics.update(y, y_pred)
+
+    log_metrics("Inference test", metrics.compute())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+from typing import Dict, Iterable
+import numpy as np
+
+
+DEFAULT_K_VALUES = (100, 1000)
+CALIBRATION_BINS = 10
+HISTOGRAM_BINS = 10_000
+
+
+def _trapezoid(y: np.ndarray, x: np.ndarray) -> float:
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2))
+
+
+def _curve_metrics(tps: np.ndarray, fps: np.ndarray) -> Dict[str, float]:
+    """PR AUC and ROC AUC from the cumulative true and false positives at each
+    threshold, from the highest score to the lowest."""
+    positives, negatives = tps[-1], fps[-1]
+    if positives == 0 or negatives == 0:
+        return {"pr_auc": np.nan, "roc_auc": np.nan}
+
+    precision = tps / (tps + fps)
+    recall = np.r_[0, tps / positives]
+    fpr = np.r_[0, fps / negatives]
+
+    return {
+        "pr_auc": _trapezoid(np.r_[1, precision], recall),
+        "roc_auc": _trapezoid(recall, fpr),
+    }
+
+
+def _calibration_error(
+    counts: np.ndarray, score_sums: np.ndarray, positives: np.ndarray
+) -> float:
+    """Expected calibration error: mean over bins of |mean score - positive rate|
+    weighted by the share of rows in the bin."""
+    return float(np.abs(score_sums - positives).sum() / counts.sum())
+
+
+def _empty_metrics(k_values: Iterable[int]) -> Dict[str, float]:
+    """Metrics of no predictions at all, NaN like the AUCs of a single class."""
+    metrics = {"pr_auc": np.nan, "roc_auc": np.nan}
+    for k in k_values:
+        metrics[f"precision_at_{k}"] = np.nan
+    metrics["calibration_error"] = np.nan
+    return metrics
+
+
+def compute_metrics(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    k_values: Iterable[int] = DEFAULT_K_VALUES,
+    calibration_bins: int = CALIBRATION_BINS,
+) -> Dict[str, float]:
+    """
+    PR AUC, ROC AUC, precision@k and calibration error from a single sort of the
+    predictions. The AUCs match sklearn's auc(precision_recall_curve) and
+    roc_auc_score. Every metric is NaN when there are no predictions.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if len(y_pred) == 0:
+        return _empty_metrics(k_values)
+
+    order = np.argsort(y_pred, kind="mergesort")[::-1]
+    sorted_pred, sorted_true = y_pred[order], y_true[order]
+    threshold_idxs = np.r_[np.flatnonzero(np.diff(sorted_pred)), len(y_pred) - 1]
+    cumulative_tps = np.cumsum(sorted_true)
+    tps = cumulative_tps[threshold_idxs]
+    fps = threshold_idxs + 1 - tps
+
+    metrics = _curve_metrics(tps, fps)
+    for k in k_values:
+        top_k = min(k, len(y_pred))
+        metrics[f"precision_at_{k}"] = float(cumulative_tps[top_k - 1] / top_k)
+
+    bins = np.clip(
+        (y_pred * calibration_bins).astype(np.int64), 0, calibration_bins - 1
+    )
+    metrics["calibration_error"] = _calibration_error(
+        np.bincount(bins, minlength=calibration_bins),
+        np.bincount(bins, weights=y_pred, minlength=calibration_bins),
+        np.bincount(bins, weights=y_true, minlength=calibration_bins),
+    )
+    return metrics
+
+
+class MetricsAccumulator:
+    """
+    Fixed-bin histograms of the scores of positives and negatives, so metrics can
+    be computed for data scored in chunks or in several processes: update it with
+    every chunk, merge the accumulators of every shard and compute once.
+
+    Scores are treated as tied within a bin, so the AUCs are those of the scores
+    rounded to 1 / n_bins and precision@k interpolates inside the bin holding the
+    k-th row. Calibration error is exact when calibration_bins divides n_bins.
+    """
+
+    def __init__(self, n_bins: int = HISTOGRAM_BINS):
+        self.n_bins = n_bins
+        self.positives = np.zeros(n_bins, dtype=np.int64)
+        self.negatives = np.zeros(n_bins, dtype=np.int64)
+        self.score_sums = np.zeros(n_bins, dtype=np.float64)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> "MetricsAccumulator":
+        y_true = np.asarray(y_true, dtype=bool)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        bins = np.clip((y_pred * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+
+        self.positives += np.bincount(bins[y_true], minlength=self.n_bins)
+        self.negatives += np.bincount(bins[~y_true], minlength=self.n_bins)
+        self.score_sums += np.bincount(bins, weights=y_pred, minlength=self.n_bins)
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        if other.n_bins != self.n_bins:
+            raise ValueError(f"Cannot merge {other.n_bins} bins into {self.n_bins}")
+        self.positives += other.positives
+        self.negatives += other.negatives
+        self.score_sums += other.score_sums
+        return self
+
+    def compute(
+        self,
+        k_values: Iterable[int] = DEFAULT_K_VALUES,
+        calibration_bins: int = CALIBRATION_BINS,
+    ) -> Dict[str, float]:
+        counts = self.positives + self.negatives
+        if counts.sum() == 0:
+            return _empty_metrics(k_values)
+        non_empty = counts[::-1] > 0
+        tps = np.cumsum(self.positives[::-1])[non_empty]
+        fps = np.cumsum(self.negatives[::-1])[non_empty]
+
+        metrics = _curve_metrics(tps, fps)
+
+        bin_counts = counts[::-1][non_empty]
+        bin_rates = self.positives[::-1][non_empty] / bin_counts
+        seen = tps + fps
+        for k in k_values:
+            top_k = min(k, int(seen[-1]))
+            i = int(np.searchsorted(seen, top_k))
+            true_positives = tps[i] - (seen[i] - top_k) * bin_rates[i]
+            metrics[f"precision_at_{k}"] = float(true_positives / top_k)
+
+        calibration = np.arange(self.n_bins) * calibration_bins // self.n_bins
+        metrics["calibration_error"] = _calibration_error(
+            np.bincount(calibration, weights=counts, minlength=calibration_bins),
+            np.bincount(
+                calibration, weights=self.score_sums, minlength=calibration_bins
+            ),
+            np.bincount(
+                calibration, weights=self.positives, minlength=calibration_bins
+            ),
+        )
+        return metrics
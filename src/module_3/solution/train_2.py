@@ -1,14 +1,19 @@
-from typing import Tuple
+from typing import Dict, List, Tuple
+from collections import defaultdict
+import numpy as np
 import pandas as pd
 import os
 import logging
 import joblib
 import datetime
-from sklearn.metrics import precision_recall_curve, roc_auc_score, auc
+import time
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.model_selection import ParameterGrid
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.base import BaseEstimator
+from module_3.metrics import compute_metrics
 from module_3.utils import build_feature_frame
 
 
@@ -22,6 +27,10 @@ HOLDOUT_SIZE = 0.2
 
 RIDGE_Cs = [1e-8, 1e-6, 1e-4, 1e-2] # Pruebo con 4 valores por si acaso en producción cambia algo mi dataset y mi modelo puede adaptarse a un mejor valor de regularización
 
+PARAM_GRID = {"C": RIDGE_Cs}
+
+N_JOBS = -1
+
 FEATURE_COLS = [
     "ordered_before",
     "abandoned_before",
@@ -40,14 +49,17 @@ def evaluate_model(model_name: str, y_test: pd.Series, y_pred: pd.Series) -> flo
     """
     Evaluate model based on precision-recall AUC. We use ROC AUC as a secondary metric.
     """
-    precision_, recall_, _ = precision_recall_curve(y_test, y_pred)
-    pr_auc = auc(recall_, precision_)
-    roc_auc = roc_auc_score(y_test, y_pred)
+    metrics = compute_metrics(y_test, y_pred, k_values=())
+    pr_auc, roc_auc = metrics["pr_auc"], metrics["roc_auc"]
     logger.info(
         f"{model_name} results: {{PR AUC: {pr_auc:.2f}, 'ROC AUC': {roc_auc:.2f}}}"
     )
     return pr_auc
 
+
+def compute_pr_auc(y_test: pd.Series, y_pred: pd.Series) -> float:
+    return compute_metrics(y_test, y_pred, k_values=())["pr_auc"]
+
 def feature_label_split(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
     return df[FEATURE_COLS], df[LABEL_COL]
 
@@ -81,7 +93,103 @@ def save_model(model: BaseEstimator, model_name: str) -> None:
     
     joblib.dump(model, os.path.join(OUTPUT_PATH, model_name))
 
-def ridge_model_selection(df: pd.DataFrame) -> None:
+
+def split_regularisation_paths(
+    param_grid: Dict[str, List], n_jobs: int
+) -> List[List[Dict]]:
+    """
+    Groups the candidates that only differ in C into regularisation paths sorted
+    from the strongest to the weakest regularisation, and cuts them into
+    contiguous segments until there are enough of them to keep n_jobs busy.
+    """
+    paths = defaultdict(list)
+    for params in ParameterGrid(param_grid):
+        other_params = tuple(
+            sorted((k, repr(v)) for k, v in params.items() if k != "C")
+        )
+        paths[other_params].append(params)
+
+    n_segments = -(-n_jobs // len(paths))
+    segments = []
+    for path in paths.values():
+        path = sorted(path, key=lambda params: params.get("C", 1.0))
+        for segment in np.array_split(np.arange(len(path)), min(n_segments, len(path))):
+            segments.append([path[i] for i in segment])
+    return segments
+
+
+def fit_regularisation_path(
+    path: List[Dict],
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+) -> List[Dict]:
+    """
+    Fits the candidates of a path in order, each one starting from the coefficients
+    of the previous one (for the solvers that support warm_start).
+    """
+    lr = LogisticRegression(penalty="l2", warm_start=True)
+    results = []
+
+    for params in path:
+        lr.set_params(**params)
+        start = time.perf_counter()
+        lr.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        results.append({
+            **params,
+            "fit_time": fit_time,
+            "n_iter": int(np.max(lr.n_iter_)),
+            "train_pr_auc": compute_pr_auc(y_train, lr.predict_proba(X_train)[:, 1]),
+            "val_pr_auc": compute_pr_auc(y_val, lr.predict_proba(X_val)[:, 1]),
+            "coef": lr.coef_.copy(),
+            "intercept": lr.intercept_.copy(),
+        })
+    return results
+
+
+def search_hyperparameters(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    param_grid: Dict[str, List] = PARAM_GRID,
+    n_jobs: int = N_JOBS,
+) -> pd.DataFrame:
+    """
+    Evaluates every LogisticRegression candidate of param_grid on the validation
+    set, running the regularisation paths in parallel. The StandardScaler is fitted
+    once on the training set and shared by all the candidates.
+
+    Returns one row per candidate with its parameters, fit time, iterations,
+    training and validation PR AUC and fitted coefficients, best first.
+    """
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled, X_val_scaled = scaler.transform(X_train), scaler.transform(X_val)
+    y_train, y_val = np.asarray(y_train), np.asarray(y_val)
+
+    paths = split_regularisation_paths(param_grid, effective_n_jobs(n_jobs))
+    path_results = Parallel(n_jobs=min(effective_n_jobs(n_jobs), len(paths)))(
+        delayed(fit_regularisation_path)(
+            path, X_train_scaled, y_train, X_val_scaled, y_val
+        )
+        for path in paths
+    )
+
+    return (
+        pd.DataFrame([result for results in path_results for result in results])
+        .sort_values("val_pr_auc", ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def ridge_model_selection(
+    df: pd.DataFrame,
+    param_grid: Dict[str, List] = PARAM_GRID,
+    n_jobs: int = N_JOBS,
+) -> Tuple[BaseEstimator, pd.DataFrame]:
     """
     After exploration we found that some strong regularisation seemed to improve the model.
     However, we prefer to do some selection here with every retrain to make sure 
@@ -91,36 +199,25 @@ def ridge_model_selection(df: pd.DataFrame) -> None:
     train_size = 1 - HOLDOUT_SIZE
     X_train, y_train, X_val, y_val = train_test_split(df, train_size=train_size)
 
-    best_auc = 0
-    best_c = None
-
-    for c in RIDGE_Cs:
-        logger.info(f"Training model with C={c}")
-        lr = make_pipeline(StandardScaler(), LogisticRegression(penalty="l2", C=c))
-        lr.fit(X_train, y_train)
-
-        _ = evaluate_model(
-            f"Training with C={c}", y_test=y_train, y_pred=lr.predict_proba(X_train)[:, 1]
-        )
-
-        pr_auc = evaluate_model(
-            f"Validation with C={c}", y_test=y_val, y_pred=lr.predict_proba(X_val)[:, 1]
-        )
+    results = search_hyperparameters(X_train, y_train, X_val, y_val, param_grid, n_jobs)
+    logger.info(
+        "Hyperparameter search results:\n"
+        + results.drop(columns=["coef", "intercept"]).to_string()
+    )
 
-        if pr_auc > best_auc:
-            logger.info("New best model found")
-            best_auc = pr_auc
-            best_c = c
+    best = results.iloc[0]
+    best_params = {param: best[param] for param in ParameterGrid(param_grid)[0]}
+    logger.info(f"Training best model with {best_params} over whole dataset")
 
-    logger.info(f"Training best model with C={best_c} over whole dataset")
     best_model = make_pipeline(
-        StandardScaler(), LogisticRegression(penalty="l2", C=best_c)
+        StandardScaler(), LogisticRegression(penalty="l2", **best_params)
     )
 
     X, y = feature_label_split(df)
     best_model.fit(X, y)
 
-    save_model(best_model, f"ridge_{best_c}")
+    save_model(best_model, "ridge_" + "_".join(str(v) for v in best_params.values()))
+    return best_model, results
 
 def main():
     feature_frame = build_feature_frame()
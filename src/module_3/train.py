@@ -1,15 +1,20 @@
-from typing import Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import os
+import sys
 import logging
 import joblib
 import datetime
+import time
+from functools import partial
+from joblib import Parallel, delayed
 from sklearn.compose import ColumnTransformer
-from sklearn.metrics import precision_recall_curve, roc_auc_score, auc
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import OrdinalEncoder, StandardScaler
 from sklearn.base import BaseEstimator
+from module_3.metrics import compute_metrics
 from module_3.utils import (
     get_numerical_cols, get_feature_cols, build_feature_frame,
     LABEL_COL, BINARY_COLS, CATEGORICAL_COLS
@@ -25,30 +30,193 @@ logger.addHandler(consoleHandler)
 
 TRAIN_SIZE = 0.8
 
+N_FOLDS = 4
+INITIAL_TRAIN_SIZE = 0.5
+
 OUTPUT_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "models/")
 )
 
 
-def evaluate_model(model_name: str, y_test: pd.Series, y_pred: pd.Series) -> float:
-    precision_, recall_, _ = precision_recall_curve(y_test, y_pred)
-    pr_auc = auc(recall_, precision_)
-    roc_auc = roc_auc_score(y_test, y_pred)
+def log_metrics(model_name: str, metrics: Dict[str, float]) -> None:
     logger.info(
-        f"{model_name} results: {{PR AUC: {pr_auc:.2f}, 'ROC AUC': {roc_auc:.2f}}}"
+        f"{model_name} results: {{PR AUC: {metrics['pr_auc']:.2f}, "
+        f"'ROC AUC': {metrics['roc_auc']:.2f}, "
+        f"'Calibration error': {metrics['calibration_error']:.3f}}}"
     )
-    return pr_auc
+
+
+def evaluate_model(model_name: str, y_test: pd.Series, y_pred: pd.Series) -> float:
+    metrics = compute_metrics(y_test, y_pred)
+    log_metrics(model_name, metrics)
+    return metrics["pr_auc"]
 
 def feature_label_split(df: pd.DataFrame, feature_cols) -> Tuple[pd.DataFrame, pd.Series]:
     return df[feature_cols], df[LABEL_COL]
 
+
+def get_cumulative_order_share(df: pd.DataFrame) -> pd.Series:
+    daily_orders = df.groupby("order_date").order_id.nunique()
+    return daily_orders.cumsum() / daily_orders.sum()
+
+
+def get_cutoff(cumsum_daily_orders: pd.Series, train_size: float):
+    """Last date whose cumulative order share is at most train_size, or the first
+    date if even that one is above it."""
+    position = np.searchsorted(cumsum_daily_orders.to_numpy(), train_size, "right")
+    return cumsum_daily_orders.index[max(position - 1, 0)]
+
+
+def get_backtest_folds(
+    df: pd.DataFrame,
+    n_folds: int = N_FOLDS,
+    initial_train_size: float = INITIAL_TRAIN_SIZE,
+    sliding: bool = False,
+) -> pd.DataFrame:
+    """
+    Rolling-origin folds over order_date using the same cumulative order share as
+    train_test_split. Fold i trains on the dates up to the cutoff at share
+    initial_train_size + i * step and tests until the next cutoff, where step splits
+    the remaining share in n_folds. Expanding folds train from the first date,
+    sliding ones only on the last initial_train_size share before the cutoff.
+
+    Returns one row per fold with train_start, cutoff and test_end dates (the
+    training dates are (train_start, cutoff] when sliding and [start, cutoff] when
+    expanding, the test dates (cutoff, test_end]).
+    """
+    cumsum_daily_orders = get_cumulative_order_share(df)
+    shares = np.linspace(initial_train_size, 1.0, n_folds + 1)
+
+    folds = []
+    for i, (train_share, test_share) in enumerate(zip(shares[:-1], shares[1:])):
+        folds.append({
+            "fold": i,
+            "train_start": (
+                get_cutoff(cumsum_daily_orders, train_share - initial_train_size)
+                if sliding and train_share > initial_train_size
+                else None
+            ),
+            "cutoff": get_cutoff(cumsum_daily_orders, train_share),
+            "test_end": get_cutoff(cumsum_daily_orders, test_share),
+        })
+    return pd.DataFrame(folds)
+
+
+def make_ridge_model(
+    numerical_cols: List[str],
+    binary_cols: List[str] = BINARY_COLS,
+    categorical_cols: List[str] = CATEGORICAL_COLS,
+) -> BaseEstimator:
+    categorical_preprocessor = OrdinalEncoder(
+        handle_unknown="use_encoded_value", unknown_value=-1
+    )
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("numerical", "passthrough", numerical_cols),
+            ("binary", "passthrough", binary_cols),
+            ("categorical", categorical_preprocessor, categorical_cols),
+        ]
+    )
+
+    return make_pipeline(
+        preprocessor, StandardScaler(), LogisticRegression(penalty="l2")
+    )
+
+
+def _fit_and_score_fold(
+    make_model: Callable[[], BaseEstimator],
+    X: pd.DataFrame,
+    y: np.ndarray,
+    train_start: int,
+    cutoff: int,
+    test_end: int,
+) -> dict:
+    """Fits on rows [train_start, cutoff) and scores on [cutoff, test_end). A fold
+    left without training or test rows by a small share is reported with its
+    sizes only, since there is nothing to fit or predict."""
+    scores = {"n_train": cutoff - train_start, "n_test": test_end - cutoff}
+    if cutoff == train_start or test_end == cutoff:
+        logger.warning(f"Skipping empty backtest fold: {scores}")
+        return scores
+
+    model = make_model()
+    start = time.perf_counter()
+    model.fit(X.iloc[train_start:cutoff], y[train_start:cutoff])
+    fit_time = time.perf_counter() - start
+
+    y_pred = model.predict_proba(X.iloc[cutoff:test_end])[:, 1]
+
+    return {
+        **scores,
+        "fit_time": fit_time,
+        **compute_metrics(y[cutoff:test_end], y_pred),
+    }
+
+
+def backtest(
+    df: pd.DataFrame,
+    feature_cols: List[str],
+    make_model: Optional[Callable[[], BaseEstimator]] = None,
+    n_folds: int = N_FOLDS,
+    initial_train_size: float = INITIAL_TRAIN_SIZE,
+    sliding: bool = False,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    Trains a fresh make_model() on every fold of get_backtest_folds and scores it on
+    the fold's test dates, in parallel worker processes. By default make_model is
+    the ridge pipeline of ridge_model_selection over feature_cols.
+
+    The frame is sorted by order_date, so every fold is a contiguous range of rows
+    of the same read-only feature frame: joblib memory-maps its numerical blocks
+    for the workers instead of copying them per fold.
+
+    Returns the folds table with n_train, n_test, fit_time and the metrics of
+    compute_metrics.
+    """
+    if make_model is None:
+        make_model = partial(
+            make_ridge_model,
+            [
+                col for col in feature_cols
+                if col not in BINARY_COLS + CATEGORICAL_COLS
+            ],
+            [col for col in BINARY_COLS if col in feature_cols],
+            [col for col in CATEGORICAL_COLS if col in feature_cols],
+        )
+
+    df = df.sort_values("order_date", kind="stable")
+    X = df[feature_cols].reset_index(drop=True)
+    y = df[LABEL_COL].to_numpy()
+    dates = pd.to_datetime(df["order_date"]).to_numpy()
+
+    folds = get_backtest_folds(df, n_folds, initial_train_size, sliding)
+
+    def position(date) -> int:
+        return int(np.searchsorted(dates, np.datetime64(pd.Timestamp(date)), "right"))
+
+    bounds = [
+        (
+            0 if fold.train_start is None else position(fold.train_start),
+            position(fold.cutoff),
+            position(fold.test_end),
+        )
+        for fold in folds.itertuples()
+    ]
+    scores = Parallel(n_jobs=n_jobs, max_nbytes="1M")(
+        delayed(_fit_and_score_fold)(make_model, X, y, *fold_bounds)
+        for fold_bounds in bounds
+    )
+
+    results = pd.concat([folds, pd.DataFrame(scores)], axis=1)
+    logger.info(f"Backtest results:\n{results.to_string()}")
+    return results
+
 def train_test_split(
     df: pd.DataFrame, train_size: float, feature_cols
 ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
-    daily_orders = df.groupby("order_date").order_id.nunique()
-    cumsum_daily_orders = daily_orders.cumsum() / daily_orders.sum()
-
-    cutoff = cumsum_daily_orders[cumsum_daily_orders <= train_size].idxmax()
+    cutoff = get_cutoff(get_cumulative_order_share(df), train_size)
 
     X_train, y_train = feature_label_split(df[df.order_date <= cutoff], feature_cols)
     X_val, y_val = feature_label_split(df[df.order_date > cutoff], feature_cols)
@@ -75,17 +243,7 @@ def save_model(model: BaseEstimator, model_name: str) -> None:
 def ridge_model_selection(df: pd.DataFrame, feature_cols, numerical_cols) -> None:
     X_train, y_train, X_val, y_val = train_test_split(df, TRAIN_SIZE, feature_cols)
 
-    categorical_preprocessor = OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1)
-
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("numerical", "passthrough", numerical_cols),
-            ("binary", "passthrough", BINARY_COLS),
-            ("categorical", categorical_preprocessor, CATEGORICAL_COLS),
-        ]
-    )
-
-    lr = make_pipeline(preprocessor, StandardScaler(), LogisticRegression(penalty="l2"))
+    lr = make_ridge_model(numerical_cols)
     lr.fit(X_train, y_train)
 
     _ = evaluate_model(
@@ -103,15 +261,19 @@ def ridge_model_selection(df: pd.DataFrame, feature_cols, numerical_cols) -> Non
 
     save_model(lr, "ridge")
 
-def main():
+
+def main(run_backtest: bool = False):
     feature_frame = build_feature_frame()
 
     numerical_cols = get_numerical_cols(feature_frame)
 
     feature_cols = get_feature_cols(numerical_cols, BINARY_COLS, CATEGORICAL_COLS)
 
+    if run_backtest:
+        backtest(feature_frame, feature_cols, partial(make_ridge_model, numerical_cols))
+
     ridge_model_selection(feature_frame, feature_cols, numerical_cols)
 
 
 if __name__ == "__main__":
-    main() 
+    main(run_backtest="--backtest" in sys.argv)
@@ -1,8 +1,9 @@
 import os
 import logging
+from datetime import datetime
 from joblib import load
 from module_4.train import OUTPUT_PATH, feature_label_split
-from module_4.utils import build_feature_frame, save_predictions
+from module_4.utils import iter_feature_frame, save_predictions
 
 
 logger = logging.getLogger(__name__)
@@ -16,12 +17,16 @@ def main():
     model = load(os.path.join(OUTPUT_PATH, model_name))
     logger.info(f"Loaded model {model_name}")
 
-    df = build_feature_frame()
-    X, y = feature_label_split(df)
+    date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    y_pred = model.predict_proba(X)[:, 1]
+    mode = "w"
+    for df in iter_feature_frame(list(model.feature_names_in_)):
+        X, y = feature_label_split(df)
 
-    save_predictions(y, y_pred, model_name, df)
+        y_pred = model.predict_proba(X)[:, 1]
+
+        save_predictions(y, y_pred, model_name, df, date, mode=mode)
+        mode = "a"
 
 
 if __name__ == "__main__":
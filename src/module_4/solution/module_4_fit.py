@@ -124,7 +124,9 @@ def handler_fit(event: Dict) -> Dict[str, Any]:
     Handles the model fitting process.
 
     Args:
-        event: Dictionary containing model parameters.
+        event: Dictionary containing model parameters. Setting "n_jobs" in its
+            calibration_parametrisation fits the calibration folds in parallel
+            processes, see PushModel.fit.
 
     Returns:
         A dictionary with the HTTP status code and the model path or an error message.
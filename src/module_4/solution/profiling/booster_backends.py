@@ -0,0 +1,59 @@
+"""Benchmark of the PushModel booster backends: fit time, predict latency, PR AUC.
+
+Run from src/ with: python -m module_4.solution.profiling.booster_backends
+"""
+
+import argparse
+import time
+
+from sklearn.metrics import auc, precision_recall_curve
+
+from module_4.solution.profiling.parallel_scoring import build_synthetic_frame
+from module_4.solution.push_model import PushModel
+
+BACKENDS = {
+    "gradient_boosting": {"n_estimators": 100, "max_depth": 5, "learning_rate": 0.05},
+    "hist_gradient_boosting": {"max_iter": 100, "max_depth": 5, "learning_rate": 0.05},
+    "lightgbm": {"n_estimators": 100, "max_depth": 5, "learning_rate": 0.05},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train-rows", type=int, default=200_000)
+    parser.add_argument("--test-rows", type=int, default=200_000)
+    parser.add_argument("--single-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    train = build_synthetic_frame(args.train_rows)
+    test = build_synthetic_frame(args.test_rows, seed=1)
+
+    for backend, parameters in BACKENDS.items():
+        model = PushModel({"backend": backend, **parameters}, {"cv": 3}, 0.05)
+
+        start = time.perf_counter()
+        model.fit(train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = model.predict_proba(test)
+        batch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(args.single_rows):
+            model.predict_proba(test.iloc[i : i + 1])
+        single_latency = (time.perf_counter() - start) / args.single_rows
+
+        precision, recall, _ = precision_recall_curve(
+            test[PushModel.TARGET_COLUMN], predictions
+        )
+        print(
+            f"{backend:<24} fit {fit_time:7.2f}s  "
+            f"batch {args.test_rows / batch_time:>10,.0f} rows/s  "
+            f"single row {single_latency * 1e3:6.2f} ms  "
+            f"PR AUC {auc(recall, precision):.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark of PushModel.fit time against the calibration n_jobs.
+
+Run from src/ with: python -m module_4.solution.profiling.parallel_calibration
+"""
+
+import argparse
+import time
+
+from module_4.solution.profiling.parallel_scoring import build_synthetic_frame
+from module_4.solution.push_model import PushModel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train-rows", type=int, default=200_000)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--cv", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_synthetic_frame(args.train_rows)
+    baseline = None
+    for n_jobs in range(1, args.cv + 1):
+        model = PushModel(
+            {"n_estimators": args.n_estimators, "max_depth": 5},
+            {"cv": args.cv, "n_jobs": n_jobs},
+            0.05,
+        )
+        start = time.perf_counter()
+        model.fit(df)
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(
+            f"n_jobs={model.clf.n_jobs:<3} {elapsed:7.2f}s"
+            f"  speedup x{baseline / elapsed:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark of PushModel.predict_proba scoring throughput against n_jobs.
+
+Run from src/ with: python -m module_4.solution.profiling.parallel_scoring
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from module_4.solution.push_model import PushModel
+
+
+def build_synthetic_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        rng.random((n_rows, len(PushModel.MODEL_COLUMNS))),
+        columns=PushModel.MODEL_COLUMNS,
+    )
+    df[PushModel.TARGET_COLUMN] = (
+        df["global_popularity"] + 0.3 * rng.random(n_rows) > 0.9
+    ).astype(int)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train-rows", type=int, default=50_000)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    args = parser.parse_args()
+
+    model = PushModel(
+        {"n_estimators": args.n_estimators, "max_depth": 5}, {"cv": 3}, 0.05
+    )
+    model.fit(build_synthetic_frame(args.train_rows))
+    df = build_synthetic_frame(args.rows, seed=1)
+
+    n_jobs_list = sorted({1, *[2**i for i in range(1, 6)], os.cpu_count()})
+    baseline = None
+    for n_jobs in [n for n in n_jobs_list if n <= os.cpu_count()]:
+        model.predict_proba(df.iloc[: 2 * n_jobs * 10_000], n_jobs=n_jobs)
+
+        start = time.perf_counter()
+        model.predict_proba(df, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(
+            f"n_jobs={n_jobs:<3} {elapsed:6.2f}s  {args.rows / elapsed:>10,.0f} rows/s"
+            f"  speedup x{baseline / elapsed:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
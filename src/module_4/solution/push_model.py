@@ -1,7 +1,80 @@
+import os
+import tempfile
+from functools import lru_cache
+import joblib
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import BaseEstimator
 from sklearn.calibration import CalibratedClassifierCV
-from sklearn.ensemble import GradientBoostingClassifier
-from typing import Dict, Tuple
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import check_cv
+from typing import Dict, Optional, Tuple
+
+MIN_SHARD_SIZE = 10_000
+
+DEFAULT_BACKEND = "gradient_boosting"
+
+
+def get_booster(backend: str, parameters: Dict) -> BaseEstimator:
+    """Instantiates the booster of the given backend with its own parameters.
+
+    Args:
+        - backend: "gradient_boosting" (sklearn exact splits), "hist_gradient_boosting"
+          (sklearn histogram splits) or "lightgbm".
+        - parameters: keyword arguments of the backend's classifier.
+
+    Raises:
+        - ValueError: if the backend is not one of the above.
+    """
+    if backend == "gradient_boosting":
+        return GradientBoostingClassifier(**parameters)
+    if backend == "hist_gradient_boosting":
+        return HistGradientBoostingClassifier(**parameters)
+    if backend == "lightgbm":
+        from lightgbm import LGBMClassifier
+
+        return LGBMClassifier(**{"verbose": -1, **parameters})
+    raise ValueError(f"Unknown booster backend: {backend}")
+
+
+def get_available_memory() -> Optional[int]:
+    """Bytes of free physical memory, or None if the OS does not report it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_calibration_n_jobs(n_jobs: int, n_folds: int, fold_nbytes: int) -> int:
+    """Number of processes to fit the calibration folds with.
+
+    Never more than one per fold, and no more than the free memory can hold
+    given that every worker copies its training fold out of the shared features.
+
+    Args:
+        - n_jobs: requested number of processes (-1 for all cores).
+        - n_folds: number of calibration folds.
+        - fold_nbytes: size in bytes of one training fold.
+    """
+    n_jobs = min(effective_n_jobs(n_jobs), n_folds)
+    available_memory = get_available_memory()
+    if available_memory is not None and fold_nbytes > 0:
+        n_jobs = min(n_jobs, max(1, available_memory // fold_nbytes))
+    return n_jobs
+
+
+@lru_cache(maxsize=1)
+def _load_shared_model(model_file: str) -> BaseEstimator:
+    return joblib.load(model_file, mmap_mode="r")
+
+
+def _predict_proba_shard(
+    model_file: str, features: pd.DataFrame, start: int, stop: int
+) -> np.ndarray:
+    clf = _load_shared_model(model_file)
+    return clf.predict_proba(features.iloc[start:stop])[:, 1]
+
 
 class PushModel:
     MODEL_COLUMNS = [
@@ -40,25 +113,29 @@ class PushModel:
         Args:
             classifier_parametrisation: 
                 {
-                    "GradientBoostingTree parameter": value,
-                    "Gradient Boosting Tree parameter 2": value,
+                    "backend": "gradient_boosting" (default), "hist_gradient_boosting"
+                               or "lightgbm", see get_booster,
+                    "Booster parameter": value,
+                    "Booster parameter 2": value,
                     ...
                 }
 
             calibration_parametrisation: 
                 {
-                    "Calibrated Classifier CV parameter": value,
-                    "CalibratedClassifier CV parameter 2": value,
-                    ...
+                    "cv": number of calibration folds (default 3),
+                    "n_jobs": processes to fit the folds with (default 1), see fit,
                 }
 
             prediction_threshold: Probability threshold above which a prediction is considered as 1.
         """
+        classifier_parametrisation = dict(classifier_parametrisation)
+        self.backend = classifier_parametrisation.pop("backend", DEFAULT_BACKEND)
         self.clf = CalibratedClassifierCV(
-            GradientBoostingClassifier(**classifier_parametrisation),
+            get_booster(self.backend, classifier_parametrisation),
             method='sigmoid',  # Método de calibración
             cv=calibration_parametrisation.get("cv", 3)  # Número de folds para la calibración
         )
+        self.n_jobs = calibration_parametrisation.get("n_jobs", 1)
         self.prediction_threshold = prediction_threshold
 
     def _extract_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -72,43 +149,87 @@ class PushModel:
     
     def fit(self, df: pd.DataFrame) -> None:
         """Fits the model
+
+        With n_jobs > 1 each calibration fold is fitted in its own process. The
+        features are not copied per worker: joblib memory-maps them and every
+        worker only copies its training fold, so the number of processes is
+        also capped by the free memory, see get_calibration_n_jobs.
+
         Args:
             df: dataframe containing both the features and the labels. Refer to this class MODEL_COLUMNS and TARGET_COLUMN
         """
         features, labels = self._feature_label_split(df)
+        cv = check_cv(self.clf.cv, labels, classifier=True)
+        n_folds = cv.get_n_splits(features, labels)
+        nbytes = features.memory_usage(index=False).sum()
+        fold_nbytes = nbytes * (n_folds - 1) // n_folds
+        self.clf.set_params(
+            n_jobs=get_calibration_n_jobs(self.n_jobs, n_folds, fold_nbytes)
+        )
         self.clf.fit(features, labels)
 
-    def predict(self, df: pd.DataFrame) -> pd.Series:
+    def predict(self, df: pd.DataFrame, n_jobs: int = 1) -> pd.Series:
         """Retrieves binary predictions for input X
 
         Args:
             df: DataFrame to predict
+            n_jobs: number of processes to score with, see predict_proba.
 
         Returns:
             predictions: pd.Series with predictions for X and same indices as X,
             if it has any.
         """
         features = self._extract_features(df)
-        probs = self.predict_proba(features)
+        probs = self.predict_proba(features, n_jobs=n_jobs)
         predictions = (probs > self.prediction_threshold).astype(int)
         return predictions
     
 
-    def predict_proba (self, df: pd.DataFrame) -> pd.Series: 
+    def predict_proba (self, df: pd.DataFrame, n_jobs: int = 1) -> pd.Series: 
         """Retrieves probability predictions for input X
 
         Args:
             - df: DataFrame to predict
+            - n_jobs: number of processes to score with (-1 for all cores). Frames
+              of fewer than MIN_SHARD_SIZE rows per job are scored in-process.
 
         Returns:
             - predictions: pd. Series with predictions for X and same indices as X, if it has any.
         """
     
         features = self._extract_features(df)
-        predictions = self.clf.predict_proba(features)[:, 1]
+        n_jobs = min(effective_n_jobs(n_jobs), len(features) // MIN_SHARD_SIZE)
+
+        if n_jobs > 1:
+            predictions = self._predict_proba_parallel(features, n_jobs)
+        else:
+            predictions = self.clf.predict_proba(features)[:, 1]
         predictions = pd.Series(predictions, name="predictions")
 
         if hasattr(features, "index"):
             predictions.index = features.index
 
         return predictions
+
+    def _predict_proba_parallel(
+        self, features: pd.DataFrame, n_jobs: int
+    ) -> np.ndarray:
+        """Scores one contiguous shard of the features per process.
+
+        The fitted model is dumped once and every worker loads it with
+        mmap_mode="r", so the arrays it holds are shared through the page cache
+        instead of being pickled into each task. The features are passed as they
+        are together with the shard offsets: joblib memory-maps their blocks
+        once for all the workers. The shard predictions are concatenated back
+        in order.
+        """
+        bounds = np.linspace(0, len(features), n_jobs + 1).astype(int)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_file = os.path.join(tmp_dir, "push_model.joblib")
+            joblib.dump(self.clf, model_file)
+            shard_predictions = Parallel(n_jobs=n_jobs, max_nbytes="1M")(
+                delayed(_predict_proba_shard)(model_file, features, start, stop)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            )
+        return np.concatenate(shard_predictions)
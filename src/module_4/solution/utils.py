@@ -1,11 +1,18 @@
 from pathlib import Path
+from typing import Optional
+import hashlib
+import json
 import logging
+import os
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 DATA_PATH = Path("../../../data").resolve()
+CACHE_PATH = DATA_PATH / "feature_frame_cache"
+SOURCE_INDEX_FILE = "source.json"
+
 
 def load_raw_dataset() -> pd.DataFrame:
     loading_file = (
@@ -14,17 +21,74 @@ def load_raw_dataset() -> pd.DataFrame:
     logger.info(f"Loading dataset from {loading_file}")
     return pd.read_csv(loading_file)
 
+
 def push_relevant_orders(df: pd.DataFrame, min_products: int = 5) -> pd.DataFrame:
     """We are only interested in big enough orders that are profitable"""
     order_size = df.groupby("order_id").size()
     orders_of_min_size = order_size[order_size >= min_products].index
     return df.loc[lambda x: x.order_id.isin(orders_of_min_size)]
 
-def load_training_feature_frame() -> pd.DataFrame:
-    df = load_raw_dataset().pipe(push_relevant_orders)
+
+def get_source_hash(loading_file: Path) -> str:
+    """sha1 of the raw dataset, only recomputed when its size or mtime have
+    changed since the last time it was hashed."""
+    stat = loading_file.stat()
+    signature = [str(loading_file), stat.st_size, stat.st_mtime_ns]
+    index_file = CACHE_PATH / SOURCE_INDEX_FILE
+    if index_file.exists():
+        index = json.loads(index_file.read_text())
+        if index["signature"] == signature:
+            return index["sha1"]
+
+    with open(loading_file, "rb") as f:
+        source_hash = hashlib.file_digest(f, "sha1").hexdigest()
+    CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    index_file.write_text(json.dumps({"signature": signature, "sha1": source_hash}))
+    return source_hash
+
+
+def get_cache_file(min_products: int) -> Optional[Path]:
+    """Parquet file caching the training feature frame of the current raw
+    dataset, keyed by its content hash and by min_products."""
+    loading_file = DATA_PATH / Path("feature_frame.csv")
+    if not loading_file.exists():
+        return None
+
+    source_hash = get_source_hash(loading_file)
+    params_hash = hashlib.sha1(json.dumps([min_products]).encode()).hexdigest()
+    return CACHE_PATH / f"{source_hash}_{params_hash}.parquet"
+
+
+def save_cache(feature_frame: pd.DataFrame, cache_file: Path) -> None:
+    """Stores the feature frame, dropping caches of previous raw datasets"""
+    CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    source_hash = cache_file.name.split("_")[0]
+    for file in CACHE_PATH.iterdir():
+        if file.name != SOURCE_INDEX_FILE and not file.name.startswith(source_hash):
+            file.unlink()
+
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    feature_frame.to_parquet(tmp_file)
+    tmp_file.replace(cache_file)
+    logger.info(f"Feature frame cached in {cache_file}")
+
+
+def load_training_feature_frame(
+    min_products: int = 5, use_cache: bool = True
+) -> pd.DataFrame:
+    cache_file = get_cache_file(min_products) if use_cache else None
+    if cache_file is not None and cache_file.exists():
+        logger.info(f"Loading feature frame from {cache_file}")
+        return pd.read_parquet(cache_file)
+
+    df = load_raw_dataset().pipe(push_relevant_orders, min_products)
     feature_frame = build_feature_frame(df)
+
+    if cache_file is not None:
+        save_cache(feature_frame, cache_file)
     return feature_frame
 
+
 def build_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
     logger.info("Building feature frame")
     return df.assign(
@@ -1,7 +1,14 @@
 from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import numpy as np
 import pandas as pd
 import os
+import sys
+import hashlib
+import json
 import logging
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
 logger = logging.getLogger(__name__)
@@ -18,17 +25,83 @@ PREDICTIONS_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "predictions/")
 )
 
+FEATURE_FRAME_CACHE_PATH = os.path.join(STORAGE_PATH, "feature_frame_cache")
+SOURCE_INDEX_FILE = "source.json"
+
+CHUNK_SIZE = 100_000
+
 INFO_COLS = ["variant_id", "order_id", "user_id", "created_at", "order_date"]
 LABEL_COL = "outcome"
 CATEGORICAL_COLS = ["product_type", "vendor"]
 BINARY_COLS = ["ordered_before", "abandoned_before", "active_snoozed", "set_as_regular"]
 
+ID_COLS = ["variant_id", "order_id", "user_id"]
+DATE_COLS = ["created_at", "order_date"]
+
+
+def get_dtypes(columns: List[str]) -> Dict[str, str]:
+    """Ids as int64, label and binary flags as int8, categoricals as category
+    and every other numerical feature as float32."""
+    dtypes = {}
+    for col in columns:
+        if col in ID_COLS:
+            dtypes[col] = "int64"
+        elif col in DATE_COLS:
+            dtypes[col] = "object"
+        elif col in BINARY_COLS + [LABEL_COL]:
+            dtypes[col] = "int8"
+        elif col in CATEGORICAL_COLS:
+            dtypes[col] = "category"
+        else:
+            dtypes[col] = "float32"
+    return dtypes
+
+
+def get_untyped_memory(df: pd.DataFrame) -> int:
+    """Bytes the frame would take with read_csv's default float64/int64/object."""
+    memory = df.memory_usage(index=True).loc["Index"]
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            category_sizes = np.array(
+                [sys.getsizeof(category) for category in df[col].cat.categories]
+            )
+            memory += category_sizes[df[col].cat.codes].sum() + 8 * len(df)
+        elif df[col].dtype == object:
+            memory += df[col].memory_usage(index=False, deep=True)
+        else:
+            memory += 8 * len(df)
+    return int(memory)
+
 
-def load_dataset() -> pd.DataFrame:
+def get_dataset_columns(
+    loading_file: str, columns: Optional[List[str]] = None
+) -> List[str]:
+    header = pd.read_csv(loading_file, nrows=0).columns.tolist()
+    if columns is None:
+        return header
+    required_cols = set(columns + INFO_COLS + [LABEL_COL])
+    return [col for col in header if col in required_cols]
+
+
+def load_dataset(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Loads feature_frame.csv with the dtypes of get_dtypes.
+
+    If columns is given only those are read, together with the info and label
+    columns that build_feature_frame needs.
+    """
     dataset_name = "feature_frame.csv"
     loading_file = os.path.join(STORAGE_PATH, dataset_name)
     logger.info(f"Loading dataset from {loading_file}")
-    return pd.read_csv(loading_file)
+
+    header = get_dataset_columns(loading_file, columns)
+    df = pd.read_csv(loading_file, usecols=header, dtype=get_dtypes(header))
+
+    logger.info(
+        f"Loaded {len(df)} rows: {df.memory_usage(deep=True).sum() / 1e6:.1f} MB "
+        f"typed, {get_untyped_memory(df) / 1e6:.1f} MB untyped"
+    )
+    return df
+
 
 def get_feature_cols(feature_frame: pd.DataFrame):
     return [
@@ -36,22 +109,195 @@ def get_feature_cols(feature_frame: pd.DataFrame):
         if col not in INFO_COLS + CATEGORICAL_COLS + [LABEL_COL]
     ]
 
-def push_relevant_orders(df: pd.DataFrame, min_products: int = 5) -> pd.DataFrame:
+
+def get_orders_of_min_size(df: pd.DataFrame, min_products: int = 5) -> pd.Index:
     order_size = df.groupby("order_id").outcome.sum()
-    orders_of_min_size = order_size[order_size >= min_products].index
+    return order_size[order_size >= min_products].index
+
+
+def push_relevant_orders(df: pd.DataFrame, min_products: int = 5) -> pd.DataFrame:
+    orders_of_min_size = get_orders_of_min_size(df, min_products)
     return df.loc[lambda x: x.order_id.isin(orders_of_min_size)]
 
-def build_feature_frame() -> pd.DataFrame:
+
+def get_source_hash(loading_file: str) -> str:
+    """sha1 of the CSV, only recomputed when its size or mtime have changed
+    since the last time it was hashed."""
+    stat = os.stat(loading_file)
+    signature = [loading_file, stat.st_size, stat.st_mtime_ns]
+    index_file = os.path.join(FEATURE_FRAME_CACHE_PATH, SOURCE_INDEX_FILE)
+    if os.path.exists(index_file):
+        with open(index_file) as f:
+            index = json.load(f)
+        if index["signature"] == signature:
+            return index["sha1"]
+
+    with open(loading_file, "rb") as f:
+        source_hash = hashlib.file_digest(f, "sha1").hexdigest()
+    os.makedirs(FEATURE_FRAME_CACHE_PATH, exist_ok=True)
+    with open(index_file, "w") as f:
+        json.dump({"signature": signature, "sha1": source_hash}, f)
+    return source_hash
+
+
+def get_feature_frame_cache_file(
+    min_products: int, columns: Optional[List[str]] = None
+) -> Optional[str]:
+    """Cache file of the feature frame built from the current feature_frame.csv
+    with these parameters, or None if there is no CSV to key the cache on."""
+    loading_file = os.path.join(STORAGE_PATH, "feature_frame.csv")
+    if not os.path.exists(loading_file):
+        return None
+
+    source_hash = get_source_hash(loading_file)
+    params = json.dumps([min_products, sorted(columns) if columns else None])
+    params_hash = hashlib.sha1(params.encode()).hexdigest()
+
+    return os.path.join(
+        FEATURE_FRAME_CACHE_PATH, f"{source_hash}_{params_hash}.parquet"
+    )
+
+
+def remove_stale_feature_frame_caches(cache_file: str) -> None:
+    """Removes the cache files built from a previous CSV."""
+    os.makedirs(FEATURE_FRAME_CACHE_PATH, exist_ok=True)
+    source_hash = os.path.basename(cache_file).split("_")[0]
+    for file in os.listdir(FEATURE_FRAME_CACHE_PATH):
+        if file != SOURCE_INDEX_FILE and not file.startswith(source_hash):
+            os.remove(os.path.join(FEATURE_FRAME_CACHE_PATH, file))
+
+
+def save_feature_frame_cache(df: pd.DataFrame, cache_file: str) -> None:
+    """Writes the cache file and removes the ones built from a previous CSV."""
+    remove_stale_feature_frame_caches(cache_file)
+
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_file)
+    os.replace(tmp_file, cache_file)
+    logger.info(f"Feature frame cached in {cache_file}")
+
+
+def build_feature_frame(
+    columns: Optional[List[str]] = None, min_products: int = 5, use_cache: bool = True
+) -> pd.DataFrame:
+    cache_file = (
+        get_feature_frame_cache_file(min_products, columns) if use_cache else None
+    )
+    if cache_file is not None and os.path.exists(cache_file):
+        logger.info(f"Loading feature frame from {cache_file}")
+        return pd.read_parquet(cache_file)
+
     logger.info("Building feature frame")
-    return (
-        load_dataset()
-        .pipe(push_relevant_orders)
+    df = (
+        load_dataset(columns)
+        .pipe(push_relevant_orders, min_products)
         .assign(created_at=lambda x: pd.to_datetime(x.created_at))
         .assign(order_date=lambda x: pd.to_datetime(x.order_date).dt.date)
     )
 
-def save_predictions(y, y_pred, model_name, df):
-    date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if cache_file is not None:
+        save_feature_frame_cache(df, cache_file)
+    return df
+
+
+def iter_csv_feature_frame(
+    columns: Optional[List[str]], min_products: int, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    """Streams the CSV chunk by chunk. Only order_id and the label are read in
+    full, to find the orders with at least min_products."""
+    loading_file = os.path.join(STORAGE_PATH, "feature_frame.csv")
+    logger.info(f"Streaming dataset from {loading_file}")
+
+    order_cols = ["order_id", LABEL_COL]
+    orders_of_min_size = get_orders_of_min_size(
+        pd.read_csv(loading_file, usecols=order_cols, dtype=get_dtypes(order_cols)),
+        min_products,
+    )
+
+    header = get_dataset_columns(loading_file, columns)
+    with pd.read_csv(
+        loading_file, usecols=header, dtype=get_dtypes(header), chunksize=chunksize
+    ) as reader:
+        for chunk in reader:
+            chunk = chunk.loc[lambda x: x.order_id.isin(orders_of_min_size)]
+            if chunk.empty:
+                continue
+            yield (
+                chunk.assign(created_at=lambda x: pd.to_datetime(x.created_at))
+                .assign(order_date=lambda x: pd.to_datetime(x.order_date).dt.date)
+            )
+
+
+def iter_feature_frame_cache(
+    cache_file: str, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    logger.info(f"Streaming feature frame from {cache_file}")
+    for batch in pq.ParquetFile(cache_file).iter_batches(batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+def cache_feature_frame_chunks(
+    chunks: Iterator[pd.DataFrame], cache_file: str
+) -> Iterator[pd.DataFrame]:
+    """Yields the chunks while writing them to the cache file, which is only
+    put in place once every chunk has been written."""
+    remove_stale_feature_frame_caches(cache_file)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(
+                chunk, schema=writer.schema if writer is not None else None
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_file, table.schema)
+            writer.write_table(table)
+            yield chunk
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_file)
+        raise
+
+    if writer is not None:
+        writer.close()
+        os.replace(tmp_file, cache_file)
+        logger.info(f"Feature frame cached in {cache_file}")
+
+
+def iter_feature_frame(
+    columns: Optional[List[str]] = None,
+    min_products: int = 5,
+    chunksize: int = CHUNK_SIZE,
+    use_cache: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """Yields the rows of build_feature_frame in non-empty chunks of at most
+    chunksize.
+
+    Reads them from the same parquet cache as build_feature_frame when it
+    exists. Otherwise the CSV is streamed and the cache written along the way.
+    """
+    cache_file = (
+        get_feature_frame_cache_file(min_products, columns) if use_cache else None
+    )
+    if cache_file is not None and os.path.exists(cache_file):
+        yield from iter_feature_frame_cache(cache_file, chunksize)
+        return
+
+    chunks = iter_csv_feature_frame(columns, min_products, chunksize)
+    if cache_file is None:
+        yield from chunks
+    else:
+        yield from cache_feature_frame_chunks(chunks, cache_file)
+
+
+def save_predictions(y, y_pred, model_name, df, date=None, mode="w"):
+    """Writes the predictions of df to a CSV named after model_name and date.
+
+    Passing the date of a previous call with mode="a" appends to its file,
+    which is how chunked inference writes its output incrementally.
+    """
+    date = date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     df_filtered = df[['order_id', 'user_id', 'variant_id']]
 
@@ -70,6 +316,6 @@ def save_predictions(y, y_pred, model_name, df):
 
     filename = os.path.join(PREDICTIONS_PATH, dataset_name)
 
-    df_predictions.to_csv(filename, index=False)
+    df_predictions.to_csv(filename, index=False, mode=mode, header=mode == "w")
 
     logger.info(f"Saving predictions into csv in {PREDICTIONS_PATH}")
\ No newline at end of file
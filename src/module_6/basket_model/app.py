@@ -1,12 +1,13 @@
 import uvicorn
 from fastapi import FastAPI
-from module_6.basket_model.routers import status, predict, metrics
+from module_6.basket_model.routers import status, predict, metrics, admin
 
 app = FastAPI()
 
 app.include_router(status.router)
 app.include_router(predict.router)
 app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 if __name__ == "__main__":
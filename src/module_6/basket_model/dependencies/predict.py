@@ -1,6 +1,54 @@
+import os
+from typing import NamedTuple, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from module_6.basket_model.services.basket_model import MODEL, BasketModel
 from module_6.basket_model.services.feature_store import FeatureStore
-from module_6.basket_model.services.basket_model import BasketModel
+from module_6.basket_model.services.hot_reloader import HotReloader
+from module_6.basket_model.utils import loaders, snapshot
+
+
+HOT_RELOAD_WATCH_SECONDS = float(os.getenv("HOT_RELOAD_WATCH_SECONDS", "0"))
+
+RELOAD_DURATION = Histogram(
+    "model_reload_duration_seconds",
+    "Duration of model and feature store reloads",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, float("inf")),
+)
+RELOAD_ERRORS = Counter(
+    "model_reload_errors", "Number of failed model and feature store reloads"
+)
+
+
+class ServingComponents(NamedTuple):
+    feature_store: FeatureStore
+    basket_model: BasketModel
+
+
+def load_components() -> ServingComponents:
+    return ServingComponents(feature_store=FeatureStore(), basket_model=BasketModel())
+
+
+def get_sources_fingerprint() -> Tuple[Optional[int], ...]:
+    """Modification times of the model, the snapshot pointer and the parquets.
+
+    The parquets matter when there is no snapshot, since the feature store is
+    then built from them.
+    """
+    paths = [MODEL, os.path.join(snapshot.SNAPSHOT, snapshot.CURRENT_FILE)]
+    serving_fingerprint = tuple(
+        os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        for path in paths
+    )
+    return serving_fingerprint + loaders.get_storage_fingerprint()
 
 
-feature_store = FeatureStore()
-basket_model = BasketModel()
+reloader = HotReloader(
+    load_components,
+    get_sources_fingerprint,
+    reload_duration=RELOAD_DURATION,
+    reload_errors=RELOAD_ERRORS,
+)
+if HOT_RELOAD_WATCH_SECONDS > 0:
+    reloader.watch(HOT_RELOAD_WATCH_SECONDS)
@@ -1,7 +1,25 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+
 class PredictRequest(BaseModel):
     user_id: str
 
+
 class PredictResponse(BaseModel):
     prediction: float
+
+
+class BatchPredictRequest(BaseModel):
+    user_ids: List[str]
+
+
+class UserPrediction(BaseModel):
+    user_id: str
+    prediction: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class BatchPredictResponse(BaseModel):
+    predictions: List[UserPrediction]
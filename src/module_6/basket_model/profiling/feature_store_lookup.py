@@ -0,0 +1,64 @@
+"""Microbenchmark of FeatureStore.get_features against the old pandas .loc path.
+
+Run from src/ with: python -m module_6.basket_model.profiling.feature_store_lookup
+"""
+
+import argparse
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from module_6.basket_model.services.feature_store import FeatureStore
+from module_6.basket_model.utils import snapshot
+
+
+def build_synthetic_feature_frame(
+    n_users: int, n_rows: int, seed: int = 0
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    user_ids = np.array([f"{i:0128x}" for i in range(n_users)])
+    frame = pd.DataFrame({"user_id": rng.choice(user_ids, size=n_rows)})
+    for col in snapshot.FEATURE_COLS:
+        frame[col] = rng.random(n_rows)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    feature_frame = build_synthetic_feature_frame(args.users, args.rows)
+    lookup_users = feature_frame.user_id.sample(args.lookups, random_state=0).tolist()
+
+    pandas_store = feature_frame.set_index("user_id").loc[:, snapshot.FEATURE_COLS]
+
+    def pandas_lookup():
+        for user_id in lookup_users:
+            pandas_store.loc[user_id].to_numpy()
+
+    with tempfile.TemporaryDirectory() as path:
+        snapshot.write_snapshot(feature_frame, path)
+        feature_store = FeatureStore(path)
+
+        def indexed_lookup():
+            for user_id in lookup_users:
+                feature_store.get_features(user_id)
+
+        for name, lookup in [
+            ("pandas .loc", pandas_lookup),
+            ("hashed index", indexed_lookup),
+        ]:
+            elapsed = min(timeit.repeat(lookup, number=1, repeat=3))
+            print(
+                f"{name:>12}: {elapsed / args.lookups * 1e6:8.2f} us per lookup "
+                f"({args.lookups} lookups)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark of loaders.load_orders against the previous row-wise pandas loader.
+
+Writes a synthetic orders.parquet to a temporary directory and times both.
+Run from src/ with: python -m module_6.basket_model.profiling.load_orders
+"""
+
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from module_6.basket_model.utils import loaders
+
+
+def write_synthetic_orders(path: str, n_orders: int, n_users: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    user_ids = np.array([f"{i:0128x}" for i in range(n_users)])
+    item_counts = rng.integers(1, 20, size=n_orders)
+    offsets = np.concatenate([[0], np.cumsum(item_counts)]).astype(np.int32)
+    items = rng.integers(33615294000000, 34000000000000, size=offsets[-1])
+    created_at = np.datetime64("2020-01-01") + rng.integers(
+        0, 10**8, size=n_orders
+    ).astype("timedelta64[s]")
+
+    table = pa.table(
+        {
+            "id": pa.array(np.arange(n_orders)),
+            "user_id": pa.array(rng.choice(user_ids, size=n_orders)),
+            "created_at": pa.array(created_at),
+            "order_date": pa.array(created_at.astype("datetime64[D]")),
+            "user_order_seq": pa.array(rng.integers(1, 20, size=n_orders)),
+            "ordered_items": pa.ListArray.from_arrays(
+                pa.array(offsets), pa.array(items)
+            ),
+        }
+    )
+    pq.write_table(table, path)
+
+
+def load_orders_row_by_row(path: str) -> pd.DataFrame:
+    orders = pd.read_parquet(path)
+    orders = orders.sort_values(by=["user_id", "created_at"])
+    orders["item_count"] = orders.apply(lambda x: len(x.ordered_items), axis=1)
+    orders["user_order_seq"] = (
+        orders.groupby(["user_id"])["created_at"].rank().astype(int)
+    )
+    return orders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as storage:
+        path = os.path.join(storage, "orders.parquet")
+        write_synthetic_orders(path, args.orders, args.users)
+        loaders.STORAGE = storage
+
+        for name, load in [
+            ("row-wise pandas", lambda: load_orders_row_by_row(path)),
+            ("arrow", loaders.load_orders),
+        ]:
+            start = perf_counter()
+            orders = load()
+            print(f"{name:>15}: {perf_counter() - start:7.2f} s ({len(orders)} orders)")
+            del orders
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+
+from module_6.basket_model.dependencies.predict import reloader
+
+
+router = APIRouter()
+
+
+@router.post("/admin/reload", status_code=202)
+def reload():
+    if not reloader.reload_in_background():
+        raise HTTPException(status_code=409, detail="Reload already in progress")
+    return {"detail": "Reload started"}
+
+
+@router.get("/admin/reload")
+def reload_status():
+    components = reloader.current()
+    return {
+        "reloading": reloader.is_reloading(),
+        "model_version": components.basket_model.version,
+        "feature_store_version": components.feature_store.version,
+    }
@@ -1,8 +1,15 @@
+import numpy as np
 from fastapi import APIRouter, HTTPException
 
 from module_6.basket_model.exceptions.exceptions import PredictionException, UserNotFoundException
-from module_6.basket_model.models.schemas import PredictRequest, PredictResponse
-from module_6.basket_model.dependencies.predict import feature_store, basket_model
+from module_6.basket_model.models.schemas import (
+    BatchPredictRequest,
+    BatchPredictResponse,
+    PredictRequest,
+    PredictResponse,
+    UserPrediction,
+)
+from module_6.basket_model.dependencies.predict import reloader
 
 
 router = APIRouter()
@@ -10,8 +17,9 @@ router = APIRouter()
 
 @router.post("/predict", response_model=PredictResponse)
 def predict(data: PredictRequest):
+    feature_store, basket_model = reloader.current()
     try:
-        features = feature_store.get_features(data.user_id).to_numpy()
+        features = feature_store.get_features(data.user_id)
         predictions = basket_model.predict(features)
 
         return PredictResponse(prediction=predictions.mean())
@@ -22,3 +30,35 @@ def predict(data: PredictRequest):
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict/batch", response_model=BatchPredictResponse)
+def predict_batch(data: BatchPredictRequest):
+    feature_store, basket_model = reloader.current()
+    try:
+        user_ids, row_counts, features = feature_store.get_features_batch(data.user_ids)
+        user_predictions = {}
+        if user_ids:
+            predictions = basket_model.predict(features)
+            block_offsets = np.cumsum(row_counts) - row_counts
+            means = np.add.reduceat(predictions, block_offsets) / row_counts
+            user_predictions = dict(zip(user_ids, means.tolist()))
+
+    except PredictionException as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return BatchPredictResponse(
+        predictions=[
+            UserPrediction(user_id=user_id, prediction=user_predictions[user_id])
+            if user_id in user_predictions
+            else UserPrediction(
+                user_id=user_id,
+                detail=str(
+                    UserNotFoundException("User not found in feature store", user_id)
+                ),
+            )
+            for user_id in data.user_ids
+        ]
+    )
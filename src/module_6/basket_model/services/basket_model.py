@@ -1,3 +1,4 @@
+import hashlib
 import os
 import joblib
 import numpy as np
@@ -12,6 +13,8 @@ MODEL = os.path.abspath(
 
 class BasketModel:
     def __init__(self):
+        with open(MODEL, "rb") as f:
+            self.version = hashlib.md5(f.read()).hexdigest()
         self.model = joblib.load(MODEL)
 
     def predict(self, features: np.ndarray) -> np.ndarray:
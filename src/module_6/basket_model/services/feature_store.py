@@ -1,35 +1,66 @@
-import pandas as pd
+import logging
+from typing import Dict, List, Tuple
 
-from module_6.basket_model.utils import features
-from module_6.basket_model.utils import loaders
+import numpy as np
+
+from module_6.basket_model.utils import snapshot
 from module_6.basket_model.exceptions.exceptions import UserNotFoundException
 
 
+logger = logging.getLogger(__name__)
+
+
 class FeatureStore:
-    def __init__(self):
-        orders = loaders.load_orders()
-        regulars = loaders.load_regulars()
-        mean_item_price = loaders.get_mean_item_price()
-        self.feature_store = (
-            features.build_feature_frame(orders, regulars, mean_item_price)
-            .set_index("user_id")
-            .loc[
-                :,
-                [
-                    "prior_basket_value",
-                    "prior_item_count",
-                    "prior_regulars_count",
-                    "regulars_count",
-                ],
-            ]
+    def __init__(self, snapshot_path: str = snapshot.SNAPSHOT):
+        if snapshot.snapshot_exists(snapshot_path):
+            snapshot_dir = snapshot.resolve_snapshot(snapshot_path)
+            self.version = snapshot.load_snapshot_metadata(snapshot_dir)["version"]
+            user_ids, offsets, self.features = snapshot.open_snapshot(snapshot_dir)
+        else:
+            logger.warning(
+                "No feature store snapshot in %s, building features from parquets",
+                snapshot_path,
+            )
+            self.version = None
+            user_ids, offsets, self.features = snapshot.build_feature_arrays(
+                snapshot.build_feature_frame_from_storage()
+            )
+        self.index = self._build_index(user_ids, offsets)
+
+    @staticmethod
+    def _build_index(
+        user_ids: np.ndarray, offsets: np.ndarray
+    ) -> Dict[str, Tuple[int, int]]:
+        return dict(
+            zip(user_ids.tolist(), zip(offsets[:-1].tolist(), offsets[1:].tolist()))
         )
 
-    def get_features(self, user_id: str) -> pd.DataFrame:
+    def get_features(self, user_id: str) -> np.ndarray:
         try:
-            features = self.feature_store.loc[user_id]
-        except Exception as e:
+            start, stop = self.index[user_id]
+        except KeyError as e:
             raise UserNotFoundException(
-                "User not found in feature store",
-                user_id
+                "User not found in feature store", user_id
             ) from e
-        return features
+        return self.features[start:stop]
+
+    def get_features_batch(
+        self, user_ids: List[str]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Gathers the feature rows of several users in a single pass.
+
+        Users missing from the store are skipped. Returns the user ids found, the
+        number of feature rows of each of them and their stacked feature rows, in
+        the same order as the user ids found.
+        """
+        found_user_ids = [user_id for user_id in user_ids if user_id in self.index]
+        bounds = np.array(
+            [self.index[user_id] for user_id in found_user_ids], dtype=np.int64
+        ).reshape(-1, 2)
+        starts, stops = bounds[:, 0], bounds[:, 1]
+        row_counts = stops - starts
+        block_offsets = np.cumsum(row_counts) - row_counts
+        rows = np.repeat(starts - block_offsets, row_counts) + np.arange(
+            row_counts.sum()
+        )
+        return found_user_ids, row_counts, self.features[rows]
@@ -0,0 +1,95 @@
+import logging
+import threading
+from time import sleep, time
+from typing import Any, Callable, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+
+logger = logging.getLogger(__name__)
+
+
+class HotReloader:
+    """Holds the components being served and swaps in new ones.
+
+    A reload builds new components with `load` in a background thread while
+    the current ones keep serving, then replaces them with a single reference
+    assignment, so a request always sees a consistent model and feature store
+    pair. `fingerprint` identifies the files the components are built from and
+    is polled by watch(). Both APIs share this class, each with its own loader
+    and metrics.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Any],
+        fingerprint: Callable[[], Tuple],
+        reload_duration: Optional[Histogram] = None,
+        reload_errors: Optional[Counter] = None,
+    ):
+        self.load = load
+        self.fingerprint = fingerprint
+        self.reload_duration = reload_duration
+        self.reload_errors = reload_errors
+        self.loaded_fingerprint = fingerprint()
+        self.components = load()
+        self.lock = threading.Lock()
+        self.reload_thread: Optional[threading.Thread] = None
+        self.watch_thread: Optional[threading.Thread] = None
+
+    def current(self) -> Any:
+        return self.components
+
+    def is_reloading(self) -> bool:
+        return self.reload_thread is not None and self.reload_thread.is_alive()
+
+    def reload_in_background(self) -> bool:
+        with self.lock:
+            if self.is_reloading():
+                return False
+            self.reload_thread = threading.Thread(
+                target=self.reload, name="hot-reload", daemon=True
+            )
+            self.reload_thread.start()
+            return True
+
+    def reload(self) -> None:
+        start_time = time()
+        fingerprint = self.fingerprint()
+        logger.info("Reloading model and feature store")
+        try:
+            components = self.load()
+        except Exception:
+            if self.reload_errors is not None:
+                self.reload_errors.inc()
+            logger.exception("Reload failed, keeping the current components")
+            return
+
+        self.components = components
+        self.loaded_fingerprint = fingerprint
+        if self.reload_duration is not None:
+            self.reload_duration.observe(time() - start_time)
+        logger.info("Reload completed in %.2f seconds", time() - start_time)
+
+    def watch(self, interval_seconds: float) -> None:
+        """Polls the fingerprint of the sources and reloads when it changes."""
+        if self.watch_thread is not None:
+            return
+        self.watch_thread = threading.Thread(
+            target=self._watch,
+            args=(interval_seconds,),
+            name="hot-reload-watch",
+            daemon=True,
+        )
+        self.watch_thread.start()
+
+    def _watch(self, interval_seconds: float) -> None:
+        while True:
+            sleep(interval_seconds)
+            try:
+                changed = self.fingerprint() != self.loaded_fingerprint
+            except OSError:
+                logger.warning("Model or feature files not readable, skipping check")
+                continue
+            if changed:
+                self.reload_in_background()
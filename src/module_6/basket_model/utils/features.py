@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from module_6.basket_model.utils import loaders
+
 
 def count_regulars_in_order(order: pd.DataFrame, user_regulars: pd.DataFrame) -> int:
     return len(set(order.ordered_items).intersection(set(user_regulars.variant_id.values)))
@@ -9,11 +11,25 @@ def count_regulars_in_order(order: pd.DataFrame, user_regulars: pd.DataFrame) ->
 def count_regulars_in_orders(
     orders: pd.DataFrame, regulars: pd.DataFrame
 ) -> np.ndarray:
-    counts = []
-    for _, order in orders.iterrows():
-        user_regulars = regulars.loc[lambda x: x.user_id == order.user_id]
-        counts += [count_regulars_in_order(order, user_regulars)]
-    return np.array(counts)
+    ordered_items = (
+        orders.loc[:, ["user_id", "ordered_items"]]
+        .reset_index(drop=True)
+        .rename_axis("order_position")
+        .reset_index()
+        .explode("ordered_items")
+        .dropna(subset=["ordered_items"])
+        .rename(columns={"ordered_items": "variant_id"})
+        .drop_duplicates(subset=["order_position", "variant_id"])
+        .infer_objects()
+    )
+    user_regulars = regulars.loc[:, ["user_id", "variant_id"]].drop_duplicates()
+    counts = (
+        ordered_items.merge(user_regulars, how="inner", on=["user_id", "variant_id"])
+        .groupby("order_position")
+        .size()
+        .reindex(range(len(orders)), fill_value=0)
+    )
+    return counts.to_numpy()
 
 
 def compute_basket_value(orders: pd.DataFrame, mean_item_price: float) -> float:
@@ -72,3 +88,45 @@ def build_feature_frame(
         left_on=("user_id", "user_order_seq"),
         right_on=("user_id", "user_order_seq_plus_1"),
     ).drop(["user_order_seq", "user_order_seq_plus_1"], axis=1)
+
+
+def get_affected_users(
+    new_orders: pd.DataFrame, new_regulars: pd.DataFrame
+) -> np.ndarray:
+    return np.union1d(new_orders.user_id.unique(), new_regulars.user_id.unique())
+
+
+def update_feature_frame(
+    feature_frame: pd.DataFrame,
+    user_orders: pd.DataFrame,
+    user_regulars: pd.DataFrame,
+    new_orders: pd.DataFrame,
+    new_regulars: pd.DataFrame,
+    mean_item_price: float,
+) -> pd.DataFrame:
+    """Merges a delta of new orders and regulars into an existing feature frame.
+
+    Only users appearing in the delta are recomputed: a new order adds a row and
+    new regulars change regulars_count of every order of that user. user_orders
+    and user_regulars must hold the stored history of at least those users,
+    without the delta; user_order_seq and item_count are recomputed from it.
+    """
+    affected_users = get_affected_users(new_orders, new_regulars)
+
+    orders = pd.concat(
+        [user_orders.loc[lambda x: x.user_id.isin(affected_users)], new_orders],
+        ignore_index=True,
+    ).drop(columns=["item_count", "user_order_seq"], errors="ignore")
+    regulars = pd.concat(
+        [user_regulars.loc[lambda x: x.user_id.isin(affected_users)], new_regulars],
+        ignore_index=True,
+    )
+
+    unaffected = feature_frame.loc[lambda x: ~x.user_id.isin(affected_users)]
+    if orders.empty:
+        return unaffected
+
+    updated = build_feature_frame(
+        loaders.prepare_orders(orders), regulars, mean_item_price
+    )
+    return pd.concat([unaffected, updated], ignore_index=True)
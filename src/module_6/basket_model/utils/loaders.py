@@ -1,5 +1,12 @@
 import os
+import shutil
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 
 STORAGE = os.path.abspath(
@@ -7,18 +14,202 @@ STORAGE = os.path.abspath(
 )
 
 
-def load_orders() -> pd.DataFrame:
-    orders = pd.read_parquet(os.path.join(STORAGE, "orders.parquet"))
+ORDER_COLUMNS = ("user_id", "created_at", "ordered_items")
+
+FEATURE_SOURCES = ("orders.parquet", "regulars.parquet", "inventory.parquet")
+
+DELTAS = "deltas"
+
+
+def get_storage_fingerprint() -> Tuple[Optional[int], ...]:
+    """Modification times of the parquets the features are built from and of
+    the directory of stored delta batches."""
+    paths = [
+        os.path.join(STORAGE, filename) for filename in FEATURE_SOURCES + (DELTAS,)
+    ]
+    return tuple(
+        os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        for path in paths
+    )
+
+
+def _user_filter(user_ids: Optional[List[str]]):
+    return None if user_ids is None else [("user_id", "in", list(user_ids))]
+
+
+def list_batches() -> List[str]:
+    """Ids of the delta batches stored by store_delta, in order."""
+    deltas = os.path.join(STORAGE, DELTAS)
+    if not os.path.isdir(deltas):
+        return []
+    return sorted(
+        entry.name
+        for entry in os.scandir(deltas)
+        if entry.is_dir() and not entry.name.endswith(".tmp")
+    )
+
+
+def _storage_schema(filename: str) -> pa.Schema:
+    """Schema of a source parquet without the pandas index columns, which the
+    delta files do not have."""
+    schema = pq.read_schema(os.path.join(STORAGE, filename))
+    index_columns = [
+        column
+        for column in (schema.pandas_metadata or {}).get("index_columns", [])
+        if isinstance(column, str)
+    ]
+    return pa.schema([field for field in schema if field.name not in index_columns])
+
+
+def _read_storage(
+    filename: str,
+    columns: Optional[Sequence[str]] = None,
+    user_ids: Optional[List[str]] = None,
+    exclude_batches: Sequence[str] = (),
+) -> pa.Table:
+    """Reads a source parquet together with its rows in every stored batch."""
+    paths = [os.path.join(STORAGE, filename)] + [
+        path
+        for path in (
+            os.path.join(STORAGE, DELTAS, batch_id, filename)
+            for batch_id in list_batches()
+            if batch_id not in exclude_batches
+        )
+        if os.path.exists(path)
+    ]
+    return pq.read_table(
+        paths,
+        schema=_storage_schema(filename),
+        columns=None if columns is None else list(columns),
+        filters=_user_filter(user_ids),
+    )
+
+
+def rank_orders_within_users(
+    user_ids: np.ndarray, created_at: np.ndarray
+) -> np.ndarray:
+    """Rank of each order among its user's orders by created_at.
+
+    Expects the orders sorted by user and created_at. Ties get the truncated
+    average rank, as groupby().rank().astype(int) does.
+    """
+    n_orders = len(user_ids)
+    if n_orders == 0:
+        return np.empty(0, dtype=int)
+
+    new_user = np.ones(n_orders, dtype=bool)
+    new_user[1:] = user_ids[1:] != user_ids[:-1]
+    new_tie = new_user.copy()
+    new_tie[1:] |= created_at[1:] != created_at[:-1]
+
+    positions = np.arange(n_orders)
+    user_starts = np.maximum.accumulate(np.where(new_user, positions, 0))
+    user_positions = positions - user_starts + 1
+
+    tie_starts = np.flatnonzero(new_tie)
+    tie_ends = np.append(tie_starts[1:], n_orders)
+    tie_ranks = (user_positions[tie_starts] + user_positions[tie_ends - 1]) // 2
+    return np.repeat(tie_ranks, tie_ends - tie_starts)
+
+
+def prepare_orders(orders: pd.DataFrame) -> pd.DataFrame:
     orders = orders.sort_values(by=["user_id", "created_at"])
-    orders["item_count"] = orders.apply(lambda x: len(x.ordered_items), axis=1)
-    orders["user_order_seq"] = (
-        orders.groupby(["user_id"])["created_at"].rank().astype(int)
+    orders["item_count"] = orders.ordered_items.str.len()
+    orders["user_order_seq"] = rank_orders_within_users(
+        orders.user_id.to_numpy(), orders.created_at.to_numpy()
     )
     return orders
 
 
-def load_regulars() -> pd.DataFrame:
-    return pd.read_parquet(os.path.join(STORAGE, "regulars.parquet"))
+def load_orders(
+    user_ids: Optional[List[str]] = None,
+    columns: Optional[Sequence[str]] = ORDER_COLUMNS,
+    exclude_batches: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Loads orders sorted by user and created_at with item_count and user_order_seq.
+
+    Only the given parquet columns are read (all of them if columns is None),
+    item_count comes straight from the Arrow list offsets and the sort is done
+    by Arrow before converting to pandas. The orders of every stored delta
+    batch are included, except those of exclude_batches.
+    """
+    table = _read_storage("orders.parquet", columns, user_ids, exclude_batches)
+    item_count = pc.fill_null(pc.list_value_length(table["ordered_items"]), 0)
+    item_count = item_count.cast(pa.int64())
+    table = table.append_column("item_count", item_count)
+
+    sort_indices = pc.sort_indices(
+        table, sort_keys=[("user_id", "ascending"), ("created_at", "ascending")]
+    )
+    orders = table.take(sort_indices).to_pandas()
+    orders.index = sort_indices.to_numpy().astype(np.int64)
+    orders["user_order_seq"] = rank_orders_within_users(
+        orders.user_id.to_numpy(), orders.created_at.to_numpy()
+    )
+    return orders
+
+
+def load_regulars(
+    user_ids: Optional[List[str]] = None, exclude_batches: Sequence[str] = ()
+) -> pd.DataFrame:
+    return _read_storage(
+        "regulars.parquet", user_ids=user_ids, exclude_batches=exclude_batches
+    ).to_pandas()
+
+
+def _to_storage_table(filename: str, delta: pd.DataFrame) -> pa.Table:
+    """Casts delta to the schema of a source parquet, columns it lacks are left
+    null."""
+    schema = _storage_schema(filename)
+    return pa.Table.from_arrays(
+        [
+            pa.array(delta[field.name], type=field.type, from_pandas=True)
+            if field.name in delta
+            else pa.nulls(len(delta), field.type)
+            for field in schema
+        ],
+        schema=schema,
+    )
+
+
+def store_delta(
+    batch_id: str, new_orders: pd.DataFrame, new_regulars: pd.DataFrame
+) -> bool:
+    """Stores a batch of new orders and regulars in its own files under
+    STORAGE/deltas/<batch_id>, next to the untouched source parquets.
+
+    Both files are written to a temporary directory that is renamed into place,
+    so a batch is either fully stored or not at all. Storing a batch id that is
+    already there is a no-op. Returns whether the batch was stored.
+    """
+    if (
+        not batch_id
+        or os.sep in batch_id
+        or batch_id.startswith(".")
+        or batch_id.endswith(".tmp")
+    ):
+        raise ValueError(f"Invalid batch id: {batch_id!r}")
+
+    batch_dir = os.path.join(STORAGE, DELTAS, batch_id)
+    if os.path.exists(batch_dir):
+        return False
+
+    tmp_dir = f"{batch_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir)
+    for filename, delta in (
+        ("orders.parquet", new_orders),
+        ("regulars.parquet", new_regulars),
+    ):
+        if not delta.empty:
+            pq.write_table(
+                _to_storage_table(filename, delta), os.path.join(tmp_dir, filename)
+            )
+    try:
+        os.rename(tmp_dir, batch_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+    return True
 
 
 def get_mean_item_price() -> float:
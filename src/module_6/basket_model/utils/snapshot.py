@@ -0,0 +1,221 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from module_6.basket_model.utils import features
+from module_6.basket_model.utils import loaders
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = os.path.join(loaders.STORAGE, "feature_store")
+
+FEATURE_COLS = [
+    "prior_basket_value",
+    "prior_item_count",
+    "prior_regulars_count",
+    "regulars_count",
+]
+
+USER_IDS_FILE = "user_ids.npy"
+OFFSETS_FILE = "offsets.npy"
+FEATURES_FILE = "features.npy"
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+
+
+def build_feature_arrays(
+    feature_frame: pd.DataFrame,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lays out the feature frame so that every user's rows are contiguous.
+
+    Returns the sorted unique user ids, the row offsets of each user (the rows
+    of user_ids[i] are features[offsets[i]:offsets[i + 1]]) and the float64
+    feature matrix with FEATURE_COLS as columns.
+    """
+    frame = feature_frame.sort_values("user_id", kind="stable")
+    user_ids, starts = np.unique(frame.user_id.to_numpy(dtype=str), return_index=True)
+    offsets = np.append(starts, len(frame)).astype(np.int64)
+    feature_matrix = np.ascontiguousarray(
+        frame.loc[:, FEATURE_COLS].to_numpy(dtype=np.float64)
+    )
+    return user_ids, offsets, feature_matrix
+
+
+def _save_array(path: str, filename: str, array: np.ndarray) -> None:
+    with open(os.path.join(path, filename), "wb") as f:
+        np.save(f, array)
+
+
+def _prune_snapshots(path: str, keep: int) -> None:
+    versions = sorted(
+        entry.name
+        for entry in os.scandir(path)
+        if entry.is_dir() and not entry.name.endswith(".tmp")
+    )
+    for version in versions[:-keep]:
+        shutil.rmtree(os.path.join(path, version), ignore_errors=True)
+
+
+def write_snapshot(
+    feature_frame: pd.DataFrame,
+    path: str = SNAPSHOT,
+    keep: int = 2,
+    batches: Sequence[str] = (),
+) -> str:
+    """Writes a new snapshot version under path and makes it the current one.
+
+    Each version lives in its own directory and the CURRENT file is swapped to
+    point at it only once it is complete, so readers never see a half-written
+    snapshot. Workers that mapped an older version keep reading it until they
+    reopen; only the latest `keep` versions are left on disk. batches are the
+    ids of the stored delta batches included in the feature frame.
+    """
+    user_ids, offsets, feature_matrix = build_feature_arrays(feature_frame)
+    version = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    tmp_dir = os.path.join(path, f"{version}.tmp")
+    os.makedirs(tmp_dir)
+
+    _save_array(tmp_dir, FEATURES_FILE, feature_matrix)
+    _save_array(tmp_dir, OFFSETS_FILE, offsets)
+    _save_array(tmp_dir, USER_IDS_FILE, user_ids)
+
+    metadata = {
+        "version": version,
+        "columns": FEATURE_COLS,
+        "n_users": len(user_ids),
+        "n_rows": len(feature_matrix),
+        "batches": list(batches),
+    }
+    with open(os.path.join(tmp_dir, METADATA_FILE), "w") as f:
+        json.dump(metadata, f)
+    os.rename(tmp_dir, os.path.join(path, version))
+
+    tmp_file = os.path.join(path, f"{CURRENT_FILE}.tmp")
+    with open(tmp_file, "w") as f:
+        f.write(version)
+    os.replace(tmp_file, os.path.join(path, CURRENT_FILE))
+    _prune_snapshots(path, keep)
+
+    logger.info("Feature store snapshot %s written to %s", version, path)
+    return os.path.join(path, version)
+
+
+def resolve_snapshot(path: str = SNAPSHOT) -> str:
+    """Returns the directory of the current snapshot version under path."""
+    current_file = os.path.join(path, CURRENT_FILE)
+    if not os.path.exists(current_file):
+        return path
+    with open(current_file) as f:
+        return os.path.join(path, f.read().strip())
+
+
+def snapshot_exists(path: str = SNAPSHOT) -> bool:
+    return os.path.exists(os.path.join(resolve_snapshot(path), METADATA_FILE))
+
+
+def load_snapshot_metadata(path: str = SNAPSHOT) -> Dict:
+    with open(os.path.join(resolve_snapshot(path), METADATA_FILE)) as f:
+        return json.load(f)
+
+
+def open_snapshot(path: str = SNAPSHOT) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Memory-maps a snapshot written by write_snapshot.
+
+    The arrays are read-only views over the files, so every worker opening the
+    same snapshot shares its pages through the OS page cache.
+    """
+    path = resolve_snapshot(path)
+    user_ids = np.load(os.path.join(path, USER_IDS_FILE), mmap_mode="r")
+    offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+    feature_matrix = np.load(os.path.join(path, FEATURES_FILE), mmap_mode="r")
+    return user_ids, offsets, feature_matrix
+
+
+def read_snapshot_frame(path: str = SNAPSHOT) -> pd.DataFrame:
+    user_ids, offsets, feature_matrix = open_snapshot(path)
+    frame = pd.DataFrame(np.asarray(feature_matrix), columns=FEATURE_COLS)
+    frame.insert(0, "user_id", np.repeat(np.asarray(user_ids), np.diff(offsets)))
+    return frame
+
+
+def update_snapshot(
+    new_orders: pd.DataFrame,
+    new_regulars: pd.DataFrame,
+    batch_id: str,
+    path: str = SNAPSHOT,
+) -> str:
+    """Writes a new snapshot version with only the users in the delta recomputed.
+
+    The history of the affected users is read from storage without this batch
+    and the delta is added on top of it. The delta is then stored as its own
+    batch, see loaders.store_delta, before the snapshot is written, so the next
+    update sees it as history. Replaying a batch the current snapshot already
+    includes is a no-op, and replaying one that was stored but never made it
+    into a snapshot recomputes it without counting it twice.
+    """
+    applied_batches = load_snapshot_metadata(path).get("batches", [])
+    if batch_id in applied_batches:
+        logger.info("Batch %s is already in the snapshot, skipping it", batch_id)
+        return resolve_snapshot(path)
+
+    affected_users = features.get_affected_users(new_orders, new_regulars).tolist()
+    feature_frame = features.update_feature_frame(
+        read_snapshot_frame(path),
+        loaders.load_orders(affected_users, exclude_batches=[batch_id]),
+        loaders.load_regulars(affected_users, exclude_batches=[batch_id]),
+        new_orders,
+        new_regulars,
+        loaders.get_mean_item_price(),
+    )
+    loaders.store_delta(batch_id, new_orders, new_regulars)
+    return write_snapshot(feature_frame, path, batches=applied_batches + [batch_id])
+
+
+def build_feature_frame_from_storage() -> pd.DataFrame:
+    orders = loaders.load_orders()
+    regulars = loaders.load_regulars()
+    mean_item_price = loaders.get_mean_item_price()
+    return features.build_feature_frame(orders, regulars, mean_item_price)
+
+
+def rebuild_snapshot(path: str = SNAPSHOT) -> str:
+    """Writes a snapshot built from the source parquets and every stored batch."""
+    batches = loaders.list_batches()
+    return write_snapshot(build_feature_frame_from_storage(), path, batches=batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the feature store snapshot, fully or from a delta"
+    )
+    parser.add_argument("--path", default=SNAPSHOT)
+    parser.add_argument("--new-orders", help="parquet file with new orders")
+    parser.add_argument("--new-regulars", help="parquet file with new regulars")
+    parser.add_argument(
+        "--batch-id", help="id of the delta, replaying an applied one is a no-op"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.new_orders is None and args.new_regulars is None:
+        rebuild_snapshot(args.path)
+        return
+    if args.batch_id is None:
+        parser.error("--batch-id is required with --new-orders or --new-regulars")
+
+    empty = pd.DataFrame({"user_id": pd.Series(dtype=str)})
+    new_orders = pd.read_parquet(args.new_orders) if args.new_orders else empty
+    new_regulars = pd.read_parquet(args.new_regulars) if args.new_regulars else empty
+    update_snapshot(new_orders, new_regulars, args.batch_id, args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from utils import features, loaders
 
 class FeatureStore:
     def __init__(self):
+        self.version = loaders.get_storage_version()
         orders = loaders.load_orders()
         regulars = loaders.load_regulars()
         mean_item_price = loaders.get_mean_item_price()
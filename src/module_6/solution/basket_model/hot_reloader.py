@@ -0,0 +1,87 @@
+import logging
+import threading
+from time import sleep, time
+from typing import Any, Callable, Optional, Tuple
+
+from metrics import Metrics
+
+
+class HotReloader:
+    """Holds the FeatureStore and BasketModel being served and swaps in new ones.
+
+    A reload builds the new components with `load` in a background thread while
+    the current ones keep serving, then replaces them with a single reference
+    assignment, so a request always sees a consistent model and feature store
+    pair. `fingerprint` identifies the files they are built from and is polled
+    by watch().
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        load: Callable[[], Any],
+        fingerprint: Callable[[], Tuple],
+    ):
+        self.metrics = metrics
+        self.load = load
+        self.fingerprint = fingerprint
+        self.loaded_fingerprint = fingerprint()
+        self.components = load()
+        self.lock = threading.Lock()
+        self.reload_thread: Optional[threading.Thread] = None
+        self.watch_thread: Optional[threading.Thread] = None
+
+    def current(self) -> Any:
+        return self.components
+
+    def is_reloading(self) -> bool:
+        return self.reload_thread is not None and self.reload_thread.is_alive()
+
+    def reload_in_background(self) -> bool:
+        with self.lock:
+            if self.is_reloading():
+                return False
+            self.reload_thread = threading.Thread(
+                target=self.reload, name="hot-reload", daemon=True
+            )
+            self.reload_thread.start()
+            return True
+
+    def reload(self) -> None:
+        start_time_reload = time()
+        fingerprint = self.fingerprint()
+        logging.info("Reloading model and feature store")
+        try:
+            components = self.load()
+        except Exception:
+            self.metrics.increase_reload_errors()
+            logging.exception("Reload failed, keeping the current components")
+            return
+
+        self.components = components
+        self.loaded_fingerprint = fingerprint
+        self.metrics.observe_reload_duration(start_time_reload)
+        logging.info("Reload completed in %.2f seconds", time() - start_time_reload)
+
+    def watch(self, interval_seconds: float) -> None:
+        """Polls the model and parquet files and reloads when any of them change."""
+        if self.watch_thread is not None:
+            return
+        self.watch_thread = threading.Thread(
+            target=self._watch,
+            args=(interval_seconds,),
+            name="hot-reload-watch",
+            daemon=True,
+        )
+        self.watch_thread.start()
+
+    def _watch(self, interval_seconds: float) -> None:
+        while True:
+            sleep(interval_seconds)
+            try:
+                changed = self.fingerprint() != self.loaded_fingerprint
+            except OSError:
+                logging.warning("Model or feature files not readable, skipping check")
+                continue
+            if changed:
+                self.reload_in_background()
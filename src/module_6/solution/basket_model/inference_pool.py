@@ -0,0 +1,41 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from exceptions import ServiceOverloadedException
+
+
+class InferencePool:
+    """Runs blocking inference in a bounded thread pool off the event loop.
+
+    At most max_workers calls run at once and up to max_queue_size more wait
+    for a free thread. Any call beyond that is rejected straight away with a
+    ServiceOverloadedException instead of piling up in the executor queue.
+    With max_workers=0 calls run inline on the event loop.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_pending = max_workers + max_queue_size
+        self.pending = 0
+        self.executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+            if max_workers > 0
+            else None
+        )
+
+    async def run(self, func: Callable, *args) -> Any:
+        if self.executor is None:
+            return func(*args)
+
+        if self.pending >= self.max_pending:
+            raise ServiceOverloadedException(
+                "Inference queue is full", self.pending
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+        finally:
+            self.pending -= 1
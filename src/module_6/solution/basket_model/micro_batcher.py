@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from basket_model.basket_model import BasketModel
+from basket_model.inference_pool import InferencePool
+from exceptions import PredictionException, ServiceOverloadedException
+from metrics import Metrics
+
+
+class MicroBatcher:
+    """Groups concurrent predictions into a single BasketModel.predict call.
+
+    Requests are queued until max_batch_size of them are waiting or max_wait_ms
+    has passed since the first one arrived. Their features are then stacked,
+    scored together and each caller gets back the predictions for its own rows.
+    Every request brings the model it read its features with, so a request
+    never mixes a hot-reloaded model with features from the previous store;
+    requests of a batch that straddles a reload are scored per model.
+    The model runs off the event loop, in the inference_pool if one with
+    workers is given or else in a single thread owned by the batcher. At most
+    max_queue_size requests wait for a batch, any request beyond that is
+    rejected with a ServiceOverloadedException.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2,
+        inference_pool: Optional[InferencePool] = None,
+        max_queue_size: int = 0,
+    ):
+        self.metrics = metrics
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        if inference_pool is None or inference_pool.executor is None:
+            inference_pool = InferencePool(1, max_batch_size)
+        self.inference_pool = inference_pool
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.worker: Optional[asyncio.Task] = None
+
+    async def predict(self, model: BasketModel, features: np.ndarray) -> np.ndarray:
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((model, np.atleast_2d(features), future, time()))
+        except asyncio.QueueFull:
+            raise ServiceOverloadedException(
+                "Micro-batch queue is full", self.queue.qsize()
+            )
+        return await future
+
+    def _ensure_worker(self):
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.metrics.observe_batch_size(len(batch))
+            for *_, enqueued_at in batch:
+                self.metrics.observe_batch_queue_delay(enqueued_at)
+
+            model_batches: Dict[BasketModel, List[Tuple]] = {}
+            for model, features, future, _ in batch:
+                model_batches.setdefault(model, []).append((features, future))
+
+            for model, model_batch in model_batches.items():
+                try:
+                    await self._predict_batch(model, model_batch)
+                except Exception as exception:
+                    for _, future in model_batch:
+                        if not future.done():
+                            future.set_exception(exception)
+
+    async def _predict_batch(
+        self, model: BasketModel, batch: List[Tuple[np.ndarray, asyncio.Future]]
+    ) -> None:
+        features = [item[0] for item in batch]
+        try:
+            predictions = await self.inference_pool.run(
+                model.predict, np.vstack(features)
+            )
+        except (PredictionException, ValueError):
+            logging.warning("Batch of %s failed, predicting one by one", len(batch))
+            await self._predict_one_by_one(model, batch)
+            return
+
+        split_points = np.cumsum([len(rows) for rows in features])[:-1]
+        for (_, future), prediction in zip(
+            batch, np.split(predictions, split_points)
+        ):
+            if not future.done():
+                future.set_result(prediction)
+
+    async def _predict_one_by_one(
+        self, model: BasketModel, batch: List[Tuple[np.ndarray, asyncio.Future]]
+    ) -> None:
+        for features, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(
+                    await self.inference_pool.run(model.predict, features)
+                )
+            except (PredictionException, ServiceOverloadedException) as exception:
+                future.set_exception(exception)
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional, Tuple
+
+from metrics import Metrics
+
+
+class PredictionCache:
+    """Size-bounded LRU cache of basket price predictions with an optional TTL.
+
+    Predictions are cached per user for the (model version, feature store
+    version) they were computed with. A lookup with different versions means
+    the model or the features have been reloaded, so every cached entry is
+    dropped before serving it. An insert with different versions comes from a
+    request that started before the reload and is discarded instead.
+    """
+
+    def __init__(
+        self, metrics: Metrics, max_size: int = 10000, ttl_seconds: float = 0
+    ):
+        self.metrics = metrics
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict = OrderedDict()
+        self.versions: Optional[Tuple[str, str]] = None
+        self.lock = threading.Lock()
+
+    def get(self, user_id: str, versions: Tuple[str, str]) -> Optional[float]:
+        if self.max_size <= 0:
+            return None
+
+        with self.lock:
+            self._check_versions(versions)
+            entry = self.entries.get(user_id)
+            if entry is None or self._is_expired(entry[1]):
+                if entry is not None:
+                    del self.entries[user_id]
+                self.metrics.increase_prediction_cache_misses()
+                return None
+
+            self.entries.move_to_end(user_id)
+            self.metrics.increase_prediction_cache_hits()
+            return entry[0]
+
+    def put(self, user_id: str, versions: Tuple[str, str], prediction: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self.lock:
+            if versions != self.versions:
+                return
+            self.entries[user_id] = (prediction, monotonic())
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.metrics.increase_prediction_cache_evictions()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def _check_versions(self, versions: Tuple[str, str]) -> None:
+        if versions != self.versions:
+            self.entries.clear()
+            self.versions = versions
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and monotonic() - stored_at > self.ttl_seconds
@@ -0,0 +1,30 @@
+import os
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# Micro-batching of model inference across concurrent /predict requests
+MICRO_BATCHING = _get_bool("MICRO_BATCHING", False)
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+
+# Thread pool running inference off the event loop. A size of 0 runs inference
+# inline on the event loop. Requests beyond size + queue size get a 503.
+INFERENCE_POOL_SIZE = int(os.getenv("INFERENCE_POOL_SIZE", "1"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+# The forest releases the GIL once per tree, and with the default 5 ms switch
+# interval each time the pool thread wants it back it can wait 5 ms behind the
+# event loop. A shorter interval is applied while the app runs inference in a
+# thread.
+INFERENCE_SWITCH_INTERVAL_MS = float(os.getenv("INFERENCE_SWITCH_INTERVAL_MS", "0.5"))
+
+# LRU cache of predictions per user. A size of 0 disables it, a TTL of 0 keeps
+# entries until evicted or until the model or feature store changes.
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "0"))
+
+# Interval to check bin/model.joblib and the parquets for changes and reload
+# them without restarting. 0 disables the watcher; POST /admin/reload still works.
+HOT_RELOAD_WATCH_SECONDS = float(os.getenv("HOT_RELOAD_WATCH_SECONDS", "0"))
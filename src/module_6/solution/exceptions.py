@@ -21,4 +21,17 @@ class UserNotFoundException(Exception):
         details = f"Message: {self.message}"
         if self.user_id:
             details += f", User Id: {self.user_id}"
-        return f"UserNotFoundException: {details}"
\ No newline at end of file
+        return f"UserNotFoundException: {details}"
+
+
+class ServiceOverloadedException(Exception):
+    def __init__(self, message: str, pending_requests=None):
+        super().__init__(message)
+        self.message = message
+        self.pending_requests = pending_requests
+
+    def __str__(self):
+        details = f"Message: {self.message}"
+        if self.pending_requests:
+            details += f", Pending Requests: {self.pending_requests}"
+        return f"ServiceOverloadedException: {details}"
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from handlers.predict import reloader
+
+
+router = APIRouter(prefix="/admin")
+
+
+@router.post("/reload", status_code=202)
+async def reload():
+    if not reloader.reload_in_background():
+        raise HTTPException(status_code=409, detail="Reload already in progress")
+    return JSONResponse(status_code=202, content={"detail": "Reload started"})
+
+
+@router.get("/reload")
+async def reload_status():
+    components = reloader.current()
+    return {
+        "reloading": reloader.is_reloading(),
+        "model_version": components.model.version,
+        "feature_store_version": components.feature_store.version,
+    }
@@ -1,22 +1,69 @@
 import logging
+import os
 from time import time
+from typing import NamedTuple, Tuple
 from fastapi import APIRouter, HTTPException
+from basket_model.basket_model import MODEL, BasketModel
 from basket_model.feature_store import FeatureStore
-from basket_model.basket_model import BasketModel
+from basket_model.hot_reloader import HotReloader
+from basket_model.inference_pool import InferencePool
+from basket_model.micro_batcher import MicroBatcher
+from basket_model.prediction_cache import PredictionCache
 from data_model import Request, Response, HTTPError
 from metrics import Metrics
-from exceptions import UserNotFoundException, PredictionException
+from exceptions import (
+    UserNotFoundException, PredictionException, ServiceOverloadedException
+)
+from utils import loaders
+import config
 
 
 logging.basicConfig(level=logging.DEBUG)
 
-feature_store = FeatureStore()
-model = BasketModel()
+
+class ServingComponents(NamedTuple):
+    feature_store: FeatureStore
+    model: BasketModel
+
+
+def load_components() -> ServingComponents:
+    return ServingComponents(feature_store=FeatureStore(), model=BasketModel())
+
+
+def get_sources_fingerprint() -> Tuple[int, str]:
+    return os.stat(MODEL).st_mtime_ns, loaders.get_storage_version()
+
+
 metrics = Metrics()
+reloader = HotReloader(metrics, load_components, get_sources_fingerprint)
+if config.HOT_RELOAD_WATCH_SECONDS > 0:
+    reloader.watch(config.HOT_RELOAD_WATCH_SECONDS)
+prediction_cache = PredictionCache(
+    metrics,
+    max_size=config.PREDICTION_CACHE_SIZE,
+    ttl_seconds=config.PREDICTION_CACHE_TTL_SECONDS,
+)
+inference_pool = InferencePool(config.INFERENCE_POOL_SIZE, config.INFERENCE_QUEUE_SIZE)
+batcher = (
+    MicroBatcher(
+        metrics,
+        max_batch_size=config.MICRO_BATCH_MAX_SIZE,
+        max_wait_ms=config.MICRO_BATCH_MAX_WAIT_MS,
+        inference_pool=inference_pool,
+        max_queue_size=config.INFERENCE_QUEUE_SIZE,
+    )
+    if config.MICRO_BATCHING
+    else None
+)
 
 router = APIRouter(prefix="/predict")
 
 
+def predict_user(components: ServingComponents, user_id: str):
+    features = components.feature_store.get_features(user_id)
+    return components.model.predict(features.values)
+
+
 @router.post(
     "/",
     response_model=Response,
@@ -24,31 +71,53 @@ router = APIRouter(prefix="/predict")
         200: {"model": Response},
         404: {"model": HTTPError, "description": "User not found"},
         500: {"model": HTTPError, "description": "Problems processing the text"},
+        503: {"model": HTTPError, "description": "Inference queue is full"},
     }
 )
 async def predict(request: Request) -> Response:
     metrics.increase_requests()
     try:
         start_time_predict = time()
-        
-        features = feature_store.get_features(request.user_id)
-        pred = model.predict(features.values)
-    
+
+        components = reloader.current()
+        versions = (components.model.version, components.feature_store.version)
+        basket_price = prediction_cache.get(request.user_id, versions)
+        if basket_price is not None:
+            metrics.observe_predict_duration(start_time_predict)
+            return Response(basket_price=basket_price)
+
+        if batcher is not None:
+            features = await inference_pool.run(
+                components.feature_store.get_features, request.user_id
+            )
+            pred = await batcher.predict(components.model, features.values)
+        else:
+            pred = await inference_pool.run(predict_user, components, request.user_id)
+
     except UserNotFoundException as exception:
         metrics.increase_user_not_found_errors()
         logging.error("User: %s, Message: %s", request.user_id, exception.message)
         raise HTTPException(status_code=404, detail="User not found") from exception
-    
+
     except PredictionException as exception:
         metrics.increase_model_errors()
         logging.error("User: %s, Message: %s", request.user_id, exception.message)
-        raise HTTPException(status_code=500, detail="Prediction not completed") from exception
-    
+        raise HTTPException(
+            status_code=500, detail="Prediction not completed"
+        ) from exception
+
+    except ServiceOverloadedException as exception:
+        metrics.increase_overloaded_errors()
+        logging.warning("User: %s, Message: %s", request.user_id, exception.message)
+        raise HTTPException(status_code=503, detail="Service overloaded") from exception
+
     except Exception as exception:
         metrics.increase_unknown_errors()
         logging.error("User: %s, Unknown exception", request.user_id, exception)
         raise HTTPException(status_code=500, detail="Unknown exception") from exception
-    
+
+    basket_price = float(pred.mean())
+    prediction_cache.put(request.user_id, versions, basket_price)
     metrics.observe_predict_duration(start_time_predict)
-    
-    return Response(basket_price=pred.mean())
+
+    return Response(basket_price=basket_price)
@@ -23,33 +23,104 @@ class Metrics:
             documentation="Number of errors due to failed model predictions"
         )
 
+        self.overloaded_errors = Counter(
+            name="overloaded_errors",
+            documentation=(
+                "Number of requests rejected because the inference queue was full"
+            )
+        )
+
         self.unknown_errors = Counter(
             name="unknown_errors",
             documentation="Number of unknown errors"
         )
 
+        self.prediction_cache_hits = Counter(
+            name="prediction_cache_hits",
+            documentation="Number of predictions served from the prediction cache"
+        )
+
+        self.prediction_cache_misses = Counter(
+            name="prediction_cache_misses",
+            documentation="Number of predictions not found in the prediction cache"
+        )
+
+        self.prediction_cache_evictions = Counter(
+            name="prediction_cache_evictions",
+            documentation="Number of predictions evicted from the prediction cache"
+        )
+
         self.predict_duration = Histogram(
             name="predict_duration",
             documentation="Predict duration",
             buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, float("inf"))
         )
-    
-    
+
+        self.reload_errors = Counter(
+            name="reload_errors",
+            documentation="Number of failed model and feature store reloads"
+        )
+
+        self.reload_duration = Histogram(
+            name="reload_duration",
+            documentation="Duration of model and feature store reloads",
+            buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, float("inf"))
+        )
+
+        self.batch_size = Histogram(
+            name="batch_size",
+            documentation="Number of requests scored together by the micro-batcher",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, float("inf"))
+        )
+
+        self.batch_queue_delay = Histogram(
+            name="batch_queue_delay",
+            documentation="Time a request waits in the micro-batcher queue",
+            buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, float("inf"))
+        )
+
+
     def increase_requests(self):
         self.requests.inc()
-    
+
     def increase_user_not_found_errors(self):
         self.user_not_found_errors.inc()
-    
+
     def increase_model_errors(self):
         self.model_errors.inc()
-    
+
+    def increase_overloaded_errors(self):
+        self.overloaded_errors.inc()
+
     def increase_unknown_errors(self):
         self.unknown_errors.inc()
-    
+
+    def increase_prediction_cache_hits(self):
+        self.prediction_cache_hits.inc()
+
+    def increase_prediction_cache_misses(self):
+        self.prediction_cache_misses.inc()
+
+    def increase_prediction_cache_evictions(self):
+        self.prediction_cache_evictions.inc()
+
     def observe_predict_duration(self, start_time):
         elapsed_time = self._calculate_elapsed_time(start_time)
         self.predict_duration.observe(elapsed_time)
-    
+
+    def increase_reload_errors(self):
+        self.reload_errors.inc()
+
+    def observe_reload_duration(self, start_time):
+        elapsed_time = self._calculate_elapsed_time(start_time)
+        self.reload_duration.observe(elapsed_time)
+
+    def observe_batch_size(self, batch_size: int):
+        self.batch_size.observe(batch_size)
+
+    def observe_batch_queue_delay(self, start_time):
+        elapsed_time = self._calculate_elapsed_time(start_time)
+        self.batch_queue_delay.observe(elapsed_time)
+
     def _calculate_elapsed_time(self, start_time: float):
         return time() - start_time
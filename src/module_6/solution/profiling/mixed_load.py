@@ -0,0 +1,89 @@
+"""Open-loop load test mixing /predict and /status traffic against a running API.
+
+Reports latency percentiles per endpoint, so the effect of slow inference on
+cheap endpoints served by the same worker is visible. Compare runs of the API
+started with INFERENCE_POOL_SIZE=0 (inference on the event loop) and > 0.
+Start it with PREDICTION_CACHE_SIZE=0 too, the payload is always the same user
+and would otherwise be served from the prediction cache.
+
+    python mixed_load.py --predict-rate 50 --status-rate 50 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import Counter, defaultdict
+from time import perf_counter
+
+import httpx
+import numpy as np
+
+
+PAYLOAD = os.path.join(os.path.dirname(__file__), "payload.json")
+
+
+async def timed_request(client, method, url, payload, latencies, status_codes):
+    start = perf_counter()
+    try:
+        response = await client.request(method, url, json=payload)
+        status_codes[url][response.status_code] += 1
+    except httpx.HTTPError as exception:
+        status_codes[url][type(exception).__name__] += 1
+    latencies[url].append(perf_counter() - start)
+
+
+async def attack(client, method, url, payload, rate, duration, latencies, status_codes):
+    tasks = []
+    start = perf_counter()
+    for i in range(int(rate * duration)):
+        await asyncio.sleep(max(0, start + i / rate - perf_counter()))
+        tasks.append(
+            asyncio.create_task(
+                timed_request(client, method, url, payload, latencies, status_codes)
+            )
+        )
+    await asyncio.gather(*tasks)
+
+
+async def run(args):
+    with open(PAYLOAD) as f:
+        payload = json.load(f)
+
+    latencies = defaultdict(list)
+    status_codes = defaultdict(Counter)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout, limits=limits
+    ) as client:
+        await asyncio.gather(
+            attack(
+                client, "POST", "/predict/", payload,
+                args.predict_rate, args.duration, latencies, status_codes,
+            ),
+            attack(
+                client, "GET", "/status/", None,
+                args.status_rate, args.duration, latencies, status_codes,
+            ),
+        )
+
+    for url, values in latencies.items():
+        p50, p90, p99 = np.percentile(np.array(values) * 1000, [50, 90, 99])
+        print(
+            f"{url:<10} requests={len(values):<6} p50={p50:8.1f}ms "
+            f"p90={p90:8.1f}ms p99={p99:8.1f}ms codes={dict(status_codes[url])}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--predict-rate", type=float, default=50)
+    parser.add_argument("--status-rate", type=float, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--timeout", type=float, default=30)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
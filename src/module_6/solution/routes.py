@@ -1,10 +1,29 @@
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from handlers import predict, status, metrics
+from handlers import predict, status, metrics, admin
+import config
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Shortens the GIL switch interval while the app serves inference from
+    threads (see config.INFERENCE_SWITCH_INTERVAL_MS) and restores it on
+    shutdown."""
+    switch_interval = sys.getswitchinterval()
+    if config.INFERENCE_POOL_SIZE > 0 or config.MICRO_BATCHING:
+        sys.setswitchinterval(config.INFERENCE_SWITCH_INTERVAL_MS / 1000)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(switch_interval)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.include_router(status.router)
     app.include_router(metrics.router)
     app.include_router(predict.router)
+    app.include_router(admin.router)
     return app
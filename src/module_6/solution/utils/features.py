@@ -9,11 +9,25 @@ def count_regulars_in_order(order: pd.DataFrame, user_regulars: pd.DataFrame) ->
 def count_regulars_in_orders(
     orders: pd.DataFrame, regulars: pd.DataFrame
 ) -> np.ndarray:
-    counts = []
-    for _, order in orders.iterrows():
-        user_regulars = regulars.loc[lambda x: x.user_id == order.user_id]
-        counts += [count_regulars_in_order(order, user_regulars)]
-    return np.array(counts)
+    ordered_items = (
+        orders.loc[:, ["user_id", "ordered_items"]]
+        .reset_index(drop=True)
+        .rename_axis("order_position")
+        .reset_index()
+        .explode("ordered_items")
+        .dropna(subset=["ordered_items"])
+        .rename(columns={"ordered_items": "variant_id"})
+        .drop_duplicates(subset=["order_position", "variant_id"])
+        .infer_objects()
+    )
+    user_regulars = regulars.loc[:, ["user_id", "variant_id"]].drop_duplicates()
+    counts = (
+        ordered_items.merge(user_regulars, how="inner", on=["user_id", "variant_id"])
+        .groupby("order_position")
+        .size()
+        .reindex(range(len(orders)), fill_value=0)
+    )
+    return counts.to_numpy()
 
 
 def compute_basket_value(orders: pd.DataFrame, mean_item_price: float) -> float:
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import pandas as pd
 
@@ -24,3 +25,12 @@ def load_regulars() -> pd.DataFrame:
 def get_mean_item_price() -> float:
     inventory = pd.read_parquet(os.path.join(STORAGE, "inventory.parquet"))
     return inventory.price.mean()
+
+
+def get_storage_version() -> str:
+    """Fingerprint of the parquet files the features are built from."""
+    fingerprint = hashlib.md5()
+    for filename in ("orders.parquet", "regulars.parquet", "inventory.parquet"):
+        stat = os.stat(os.path.join(STORAGE, filename))
+        fingerprint.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return fingerprint.hexdigest()
@@ -1,6 +1,24 @@
+import json
+import threading
+import time
 import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from src.module_1 import module_1_meteo_api
 from src.module_1.module_1_meteo_api import (
+    ResponseCache,
+    TokenBucket,
+    get_backoff,
     make_api_call_with_cool_off,
+    get_data_meteo,
+    get_data_meteo_for_cities,
+    get_processed_df_by_period,
+    get_processed_df_from_parquet,
+    split_date_range,
+    stream_data_meteo_to_parquet,
+    VARIABLES,
+    downsample,
+    plot_df_parallel,
     get_processed_df_by_month
 )
 import pytest
@@ -10,9 +28,10 @@ import pandas as pd
 
 
 class MockResponse:
-    def __init__(self, data, status_code):
+    def __init__(self, data, status_code, headers=None):
         self.data = data
         self.status_code = status_code
+        self.headers = headers or {}
 
     def json(self):
         return self.data
@@ -113,6 +132,200 @@ def test_make_api_call_with_cool_off_request_exception(caplog):
         assert [r.msg for r in caplog.records] == log_messages
 
 
+class StubMeteoHandler(BaseHTTPRequestHandler):
+    failures_left = {}
+    requests_count = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        latitude = params["latitude"][0]
+        days = pd.date_range(params["start_date"][0], params["end_date"][0])
+
+        with self.lock:
+            StubMeteoHandler.requests_count += 1
+            failures = self.failures_left.get(latitude, 0)
+            self.failures_left[latitude] = failures - 1
+
+        if failures > 0:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps({
+            "latitude": float(latitude),
+            "daily": {
+                "time": days.strftime("%Y-%m-%d").tolist(),
+                **{
+                    variable: [float(latitude)] * len(days)
+                    for variable in VARIABLES
+                },
+            },
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_meteo_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMeteoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        module_1_meteo_api, "API_URL", f"http://127.0.0.1:{server.server_port}/?"
+    )
+    monkeypatch.setattr(module_1_meteo_api, "BACKOFF_JITTER", 0.0)
+    monkeypatch.setattr(
+        module_1_meteo_api, "rate_limiter", TokenBucket(rate=1000, capacity=1000)
+    )
+    StubMeteoHandler.failures_left = {}
+    StubMeteoHandler.requests_count = 0
+    yield StubMeteoHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_data_meteo_for_cities(stub_meteo_api):
+    coordinates = {
+        f"city_{i}": {"latitude": float(i), "longitude": 0.0} for i in range(10)
+    }
+    stub_meteo_api.failures_left = {"3.0": 1, "7.0": 2}
+
+    with patch('time.sleep') as sleep:
+        response = get_data_meteo_for_cities(
+            coordinates, "2020-01-01", "2020-01-31", max_concurrent_requests=3
+        )
+
+    assert {
+        city: data["latitude"] for city, data in response.items()
+    } == {
+        city: city_coordinates["latitude"]
+        for city, city_coordinates in coordinates.items()
+    }
+    assert sorted(call.args[0] for call in sleep.call_args_list) == [1, 1, 2]
+
+
+def test_make_api_call_with_cool_off_429_retry_after(monkeypatch, caplog):
+    headers = {}
+    responses = [
+        MockResponse("mocked_response", 429, headers={"Retry-After": "5"}),
+        MockResponse("mocked_response", 200),
+    ]
+    monkeypatch.setattr(requests, "get", Mock(side_effect=responses))
+    limiter = Mock()
+    throttles = module_1_meteo_api.request_counters.get().get("throttles", 0)
+
+    with patch('time.sleep') as sleep:
+        response = make_api_call_with_cool_off("mock_url", headers, limiter=limiter)
+
+    assert response == "mocked_response"
+    sleep.assert_called_once_with(5.0)
+    limiter.pause.assert_called_once_with(5.0)
+    assert limiter.acquire.call_count == 2
+    assert module_1_meteo_api.request_counters.get()["throttles"] == throttles + 1
+    assert [r.msg for r in caplog.records] == ["HTTP error: Error. Waiting 5.0 seconds"]
+
+
+def test_get_backoff_jitter():
+    waits = [get_backoff(4, jitter=0.5) for _ in range(100)]
+
+    assert all(2 <= wait <= 6 for wait in waits)
+    assert len(set(waits)) > 1
+    assert get_backoff(4) == 4
+
+
+def test_token_bucket_limits_rate():
+    limiter = TokenBucket(rate=50, capacity=5)
+
+    start = time.monotonic()
+    for _ in range(15):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    assert 0.18 <= elapsed < 1
+
+
+def test_split_date_range():
+    chunks = split_date_range("2010-06-15", "2012-03-01")
+
+    assert chunks == [
+        ("2010-06-15", "2010-12-31"),
+        ("2011-01-01", "2011-12-31"),
+        ("2012-01-01", "2012-03-01"),
+    ]
+
+
+def test_get_data_meteo_cache(stub_meteo_api, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+
+    response = get_data_meteo(1.0, 0.0, "2010-06-15", "2012-03-01", cache=cache)
+    assert stub_meteo_api.requests_count == 3
+    assert response["daily"]["time"][0] == "2010-06-15"
+    assert response["daily"]["time"][-1] == "2012-03-01"
+    assert len(response["daily"]["time"]) == len(
+        pd.date_range("2010-06-15", "2012-03-01")
+    )
+
+    cached_response = get_data_meteo(
+        1.0, 0.0, "2010-06-15", "2012-03-01", cache=cache
+    )
+    assert stub_meteo_api.requests_count == 3
+    assert cached_response == response
+
+    get_data_meteo(1.0, 0.0, "2010-06-15", "2013-02-01", cache=cache)
+    assert stub_meteo_api.requests_count == 5
+
+
+def test_get_data_meteo_offline_uses_expired_cache(
+    stub_meteo_api, monkeypatch, tmp_path
+):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=0)
+    response = get_data_meteo(1.0, 0.0, "2010-01-01", "2010-12-31", cache=cache)
+    time.sleep(0.01)
+
+    monkeypatch.setattr(
+        module_1_meteo_api,
+        "get_data_meteo_chunk",
+        Mock(side_effect=requests.exceptions.ConnectionError("Error")),
+    )
+
+    assert get_data_meteo(
+        1.0, 0.0, "2010-01-01", "2010-12-31", cache=cache
+    ) == response
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+
+    cache.set("a", {"values": [0] * 30})
+    cache.set("b", {"values": [0] * 30})
+    cache.get("a")
+    cache.set("c", {"values": [0] * 30})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_response_cache_entry_evicted_while_read_is_a_miss(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.set("key", {"data": 1})
+
+    def evicted_utime(path, times):
+        (tmp_path / "key.json").unlink()
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(module_1_meteo_api.os, "utime", evicted_utime)
+
+    assert cache.get("key") is None
+
+
 def test_get_processed_df_by_month():
     previous_data = {
         'time': ['2025-01-22 00:00', '2025-01-22 01:00', '2025-01-22 02:00'],
@@ -144,3 +357,122 @@ def test_get_processed_df_by_month():
     response = get_processed_df_by_month(previous_df)
 
     pd.testing.assert_frame_equal(expected_df, response)
+
+
+def get_processed_df_by_month_group_by_group(data: pd.DataFrame) -> pd.DataFrame:
+    data["time"] = pd.to_datetime(data["time"])
+    grouped_data = data.groupby([data["city"], data["time"].dt.to_period("M")])
+    processed_data = []
+
+    for (city, month), group in grouped_data:
+        monthly_data_per_city = {"city": city, "month": month.to_timestamp()}
+        for variable in VARIABLES:
+            monthly_data_per_city[f"{variable}_max"] = group[variable].max()
+            monthly_data_per_city[f"{variable}_min"] = group[variable].min()
+            monthly_data_per_city[f"{variable}_mean"] = group[variable].mean()
+            monthly_data_per_city[f"{variable}_std"] = group[variable].std()
+        processed_data.append(monthly_data_per_city)
+
+    return pd.DataFrame(processed_data)
+
+
+def sample_daily_data(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2019-11-01", "2020-03-31").strftime("%Y-%m-%d")
+    cities = [f"city_{i}" for i in range(5)]
+    data = pd.DataFrame({
+        "time": np.tile(days, len(cities)),
+        "city": np.repeat(cities, len(days)),
+    })
+    for variable in VARIABLES:
+        data[variable] = rng.normal(10, 5, size=len(data))
+    data.loc[rng.choice(len(data), size=20), "precipitation_sum"] = np.nan
+    return data.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_get_processed_df_by_month_matches_group_by_group():
+    for seed in range(3):
+        data = sample_daily_data(seed)
+
+        expected = get_processed_df_by_month_group_by_group(data.copy())
+        response = get_processed_df_by_month(data)
+
+        pd.testing.assert_frame_equal(expected, response)
+
+
+def test_get_processed_df_by_period_quarter():
+    data = sample_daily_data(0)
+
+    response = get_processed_df_by_period(data, "Q")
+
+    assert list(response.columns[:2]) == ["city", "quarter"]
+    assert len(response) == 5 * 2
+    assert response["quarter"].min() == pd.Timestamp("2019-10-01")
+    expected_max = data.loc[
+        pd.to_datetime(data["time"]) >= "2020-01-01"
+    ].groupby("city")["temperature_2m_mean"].max()
+    np.testing.assert_allclose(
+        response.loc[
+            response["quarter"] == "2020-01-01", "temperature_2m_mean_max"
+        ],
+        expected_max,
+    )
+
+
+def test_stream_data_meteo_to_parquet(stub_meteo_api, tmp_path):
+    coordinates = {
+        f"city {i}": {"latitude": float(i), "longitude": 0.0} for i in range(5)
+    }
+
+    stream_data_meteo_to_parquet(
+        coordinates, "2019-06-01", "2020-05-31", str(tmp_path),
+        max_concurrent_requests=2
+    )
+    stream_data_meteo_to_parquet(
+        coordinates, "2019-06-01", "2020-05-31", str(tmp_path),
+        max_concurrent_requests=2
+    )
+
+    city_dir = tmp_path / "city=city%203"
+    assert sorted(p.name for p in city_dir.iterdir()) == ["year=2019", "year=2020"]
+    assert len(list((city_dir / "year=2019").iterdir())) == 1
+
+    cities_data = get_data_meteo_for_cities(coordinates, "2019-06-01", "2020-05-31")
+    expected = get_processed_df_by_month(
+        pd.concat([
+            pd.DataFrame(data["daily"]).assign(city=city)
+            for city, data in cities_data.items()
+        ])
+    )
+    response = get_processed_df_from_parquet(str(tmp_path))
+
+    pd.testing.assert_frame_equal(expected, response)
+
+
+def test_downsample_keeps_envelope():
+    processed_df = get_processed_df_by_month(sample_daily_data(0))
+    city_data = processed_df[processed_df["city"] == "city_0"]
+
+    downsampled = downsample(city_data, max_points=2)
+
+    assert len(downsampled) == 2
+    assert list(downsampled.columns) == list(city_data.columns)
+    assert downsampled["temperature_2m_mean_max"].max() == pytest.approx(
+        city_data["temperature_2m_mean_max"].max()
+    )
+    assert downsampled["temperature_2m_mean_min"].min() == pytest.approx(
+        city_data["temperature_2m_mean_min"].min()
+    )
+
+
+@pytest.mark.parametrize("by", ["variable", "city"])
+def test_plot_df_parallel(by, tmp_path):
+    processed_df = get_processed_df_by_month(sample_daily_data(0))
+
+    output_files = plot_df_parallel(
+        processed_df, str(tmp_path), by=by, max_workers=2, max_points=3
+    )
+
+    names = VARIABLES if by == "variable" else processed_df["city"].unique()
+    assert output_files == [str(tmp_path / f"{name}.png") for name in names]
+    assert all((tmp_path / f"{name}.png").stat().st_size > 0 for name in names)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from sklearn.metrics import auc, precision_recall_curve, roc_auc_score
+from module_3.metrics import MetricsAccumulator, compute_metrics
+
+
+def sample_predictions(seed: int, n: int = 5000):
+    rng = np.random.default_rng(seed)
+    y_pred = rng.random(n).round(3)
+    y_true = (rng.random(n) < y_pred**2).astype(int)
+    return y_true, y_pred
+
+
+def expected_calibration_error(y_true, y_pred, n_bins=10):
+    bins = np.minimum((y_pred * n_bins).astype(int), n_bins - 1)
+    error = 0
+    for b in np.unique(bins):
+        in_bin = bins == b
+        error += abs(y_pred[in_bin].mean() - y_true[in_bin].mean()) * in_bin.mean()
+    return error
+
+
+def test_compute_metrics_matches_sklearn():
+    for seed in range(3):
+        y_true, y_pred = sample_predictions(seed)
+        precision, recall, _ = precision_recall_curve(y_true, y_pred)
+        top_100 = np.argsort(y_pred, kind="mergesort")[::-1][:100]
+
+        metrics = compute_metrics(y_true, y_pred, k_values=[100])
+
+        assert metrics["pr_auc"] == pytest.approx(auc(recall, precision))
+        assert metrics["roc_auc"] == pytest.approx(roc_auc_score(y_true, y_pred))
+        assert metrics["precision_at_100"] == y_true[top_100].mean()
+        assert metrics["calibration_error"] == pytest.approx(
+            expected_calibration_error(y_true, y_pred)
+        )
+
+
+def test_compute_metrics_single_class():
+    metrics = compute_metrics(np.zeros(10), np.linspace(0, 1, 10), k_values=[5])
+
+    assert np.isnan(metrics["pr_auc"]) and np.isnan(metrics["roc_auc"])
+    assert metrics["precision_at_5"] == 0
+
+
+def test_metrics_of_empty_predictions_are_nan():
+    expected = ["pr_auc", "roc_auc", "precision_at_100", "calibration_error"]
+
+    for metrics in (
+        compute_metrics([], [], k_values=[100]),
+        MetricsAccumulator().update([], []).compute(k_values=[100]),
+    ):
+        assert list(metrics) == expected
+        assert np.isnan(list(metrics.values())).all()
+
+
+def test_metrics_accumulator_merges_shards():
+    y_true, y_pred = sample_predictions(0)
+    shards = [
+        MetricsAccumulator(n_bins=1000).update(y_true[i::3], y_pred[i::3])
+        for i in range(3)
+    ]
+
+    accumulator = shards[0].merge(shards[1]).merge(shards[2])
+    metrics = accumulator.compute(k_values=[100, 10**6])
+    expected = compute_metrics(y_true, y_pred, k_values=[100, 10**6])
+
+    for name in ["pr_auc", "roc_auc", "calibration_error", "precision_at_1000000"]:
+        assert metrics[name] == pytest.approx(expected[name])
+    assert metrics["precision_at_100"] == pytest.approx(
+        expected["precision_at_100"], abs=0.05
+    )
+
+
+def test_metrics_accumulator_rejects_different_bins():
+    with pytest.raises(ValueError):
+        MetricsAccumulator(10).merge(MetricsAccumulator(20))
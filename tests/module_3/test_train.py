@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import roc_auc_score
+from module_3.train import (
+    backtest,
+    get_backtest_folds,
+    make_ridge_model,
+    train_test_split,
+)
+from module_3.utils import LABEL_COL
+
+
+@pytest.fixture
+def feature_frame():
+    rng = np.random.default_rng(0)
+    n = 3000
+    order_id = np.arange(n) // 5
+    df = pd.DataFrame({
+        "order_id": order_id,
+        "order_date": [
+            (pd.Timestamp("2021-01-01") + pd.Timedelta(days=int(d))).date()
+            for d in order_id // 20
+        ],
+        "global_popularity": rng.random(n),
+        "ordered_before": rng.integers(0, 2, n),
+        "vendor": rng.choice(["a", "b", "c"], n),
+    })
+    logits = 2 * df.ordered_before + 3 * df.global_popularity - 3
+    df[LABEL_COL] = (rng.random(n) < 1 / (1 + np.exp(-logits))).astype(int)
+    return df.sample(frac=1, random_state=0)
+
+
+def test_get_backtest_folds_last_fold_matches_train_test_split(feature_frame):
+    folds = get_backtest_folds(feature_frame, n_folds=4, initial_train_size=0.6)
+    _, _, X_val, _ = train_test_split(feature_frame, 0.9, ["global_popularity"])
+
+    assert list(folds.cutoff) == sorted(folds.cutoff)
+    assert list(folds.cutoff[1:]) == list(folds.test_end[:-1])
+    assert folds.test_end.iloc[-1] == feature_frame.order_date.max()
+    assert folds.train_start.isna().all()
+    assert len(X_val) == (feature_frame.order_date > folds.cutoff.iloc[-1]).sum()
+
+
+def test_get_backtest_folds_sliding(feature_frame):
+    folds = get_backtest_folds(
+        feature_frame, n_folds=3, initial_train_size=0.4, sliding=True
+    )
+
+    assert folds.train_start.iloc[0] is None
+    assert list(folds.train_start[1:]) == sorted(folds.train_start[1:])
+    assert (folds.train_start[1:] < folds.cutoff[1:]).all()
+
+
+@pytest.fixture
+def six_equal_days(feature_frame):
+    days = sorted(feature_frame.order_date.unique())[:6]
+    return feature_frame[feature_frame.order_date.isin(days)]
+
+
+def test_get_backtest_folds_sliding_window_starting_on_first_day(six_equal_days):
+    folds = get_backtest_folds(
+        six_equal_days, n_folds=3, initial_train_size=0.5, sliding=True
+    )
+    days = sorted(six_equal_days.order_date.unique())
+
+    assert folds.train_start.iloc[1] == days[0]
+    assert list(folds.cutoff) == sorted(folds.cutoff)
+    assert (folds.train_start[1:] < folds.cutoff[1:]).all()
+
+
+def test_get_backtest_folds_clamps_small_train_size_to_first_day(six_equal_days):
+    folds = get_backtest_folds(six_equal_days, n_folds=3, initial_train_size=0.1)
+    days = sorted(six_equal_days.order_date.unique())
+
+    assert folds.cutoff.iloc[0] == days[0]
+    assert folds.test_end.iloc[-1] == days[-1]
+
+
+def test_backtest_reports_empty_folds_without_fitting(six_equal_days):
+    feature_cols = ["global_popularity", "ordered_before", "vendor"]
+
+    results = backtest(
+        six_equal_days, feature_cols, n_folds=10, sliding=True, n_jobs=1
+    )
+
+    empty = (results.n_train == 0) | (results.n_test == 0)
+    assert empty.any() and not empty.all()
+    assert results.loc[empty, "roc_auc"].isna().all()
+    assert results.loc[~empty, "roc_auc"].notna().all()
+
+
+def test_backtest_matches_manual_fold(feature_frame):
+    feature_cols = ["global_popularity", "ordered_before", "vendor"]
+
+    results = backtest(feature_frame, feature_cols, n_folds=3, n_jobs=2)
+
+    fold = results.iloc[1]
+    train = feature_frame[feature_frame.order_date <= fold.cutoff]
+    test = feature_frame[
+        (feature_frame.order_date > fold.cutoff)
+        & (feature_frame.order_date <= fold.test_end)
+    ]
+    model = make_ridge_model(["global_popularity"], ["ordered_before"], ["vendor"])
+    model.fit(train[feature_cols], train[LABEL_COL])
+    y_pred = model.predict_proba(test[feature_cols])[:, 1]
+
+    assert list(results.n_train) == sorted(results.n_train)
+    assert (fold.n_train, fold.n_test) == (len(train), len(test))
+    assert fold.roc_auc == pytest.approx(roc_auc_score(test[LABEL_COL], y_pred))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from module_3.solution import train_2
+from module_3.solution.train_2 import (
+    FEATURE_COLS,
+    LABEL_COL,
+    compute_pr_auc,
+    ridge_model_selection,
+    search_hyperparameters,
+    split_regularisation_paths,
+)
+
+
+@pytest.fixture
+def feature_frame():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        "order_id": np.arange(n) // 5,
+        "order_date": pd.Timestamp("2021-01-01").date(),
+        "ordered_before": rng.integers(0, 2, n),
+        "abandoned_before": rng.integers(0, 2, n),
+        "global_popularity": rng.random(n),
+        "set_as_regular": rng.integers(0, 2, n),
+    })
+    df["order_date"] = [
+        (pd.Timestamp("2021-01-01") + pd.Timedelta(days=int(d))).date()
+        for d in df.order_id // 40
+    ]
+    logits = 2 * df.ordered_before + 3 * df.global_popularity - 3
+    df[LABEL_COL] = (rng.random(n) < 1 / (1 + np.exp(-logits))).astype(int)
+    return df
+
+
+def test_split_regularisation_paths():
+    grid = {"C": [1e-2, 1e-6, 1e-4, 1e-8], "fit_intercept": [True, False]}
+
+    paths = split_regularisation_paths(grid, n_jobs=4)
+
+    assert len(paths) == 4
+    for path in paths:
+        assert [p["C"] for p in path] == sorted(p["C"] for p in path)
+        assert len({p["fit_intercept"] for p in path}) == 1
+    assert sorted(p["C"] for path in paths for p in path) == sorted(grid["C"] * 2)
+
+
+def test_search_hyperparameters_matches_independent_fits(feature_frame):
+    X, y = feature_frame[FEATURE_COLS], feature_frame[LABEL_COL]
+    X_train, y_train, X_val, y_val = X[:1500], y[:1500], X[1500:], y[1500:]
+    grid = {"C": [1e-4, 1e-2, 1.0]}
+
+    results = search_hyperparameters(X_train, y_train, X_val, y_val, grid, n_jobs=2)
+
+    assert list(results.val_pr_auc) == sorted(results.val_pr_auc, reverse=True)
+    assert (results.fit_time > 0).all()
+    for _, result in results.iterrows():
+        lr = make_pipeline(
+            StandardScaler(), LogisticRegression(penalty="l2", C=result.C)
+        ).fit(X_train, y_train)
+        expected = compute_pr_auc(y_val, lr.predict_proba(X_val)[:, 1])
+        assert result.val_pr_auc == pytest.approx(expected, abs=1e-3)
+
+
+def test_ridge_model_selection_fits_best_candidate(feature_frame, monkeypatch):
+    saved = {}
+    monkeypatch.setattr(
+        train_2, "save_model", lambda model, name: saved.update({name: model})
+    )
+
+    model, results = ridge_model_selection(
+        feature_frame, {"C": [1e-8, 1.0]}, n_jobs=1
+    )
+
+    assert list(saved) == [f"ridge_{results.C[0]}"]
+    assert model[-1].C == results.C[0]
+    assert not model[-1].warm_start
+
+    X, y = feature_frame[FEATURE_COLS], feature_frame[LABEL_COL]
+    expected = make_pipeline(
+        StandardScaler(), LogisticRegression(penalty="l2", C=results.C[0])
+    ).fit(X, y)
+    np.testing.assert_allclose(model[-1].coef_, expected[-1].coef_)
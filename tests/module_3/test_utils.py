@@ -0,0 +1,89 @@
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from module_3.utils import (
+    build_feature_frame,
+    get_source_hash,
+    iter_feature_frame,
+    LABEL_COL,
+)
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path):
+    df = pd.DataFrame({
+        "variant_id": [1, 1, 2, 2, 3, 3],
+        "vendor": ["a", "b", "a", "b", "a", "b"],
+        "order_id": [1, 1, 2, 2, 2, 2],
+        "user_id": [7, 7, 8, 8, 8, 8],
+        "created_at": ["2023-01-01 10:00:00"] * 2 + ["2023-01-02 11:00:00"] * 4,
+        "order_date": ["2023-01-01 00:00:00"] * 2 + ["2023-01-02 00:00:00"] * 4,
+        LABEL_COL: [1.0, 0.0, 1.0, 1.0, 1.0, 0.0],
+        "global_popularity": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+    })
+    df.to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_3.utils.STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "module_3.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+    return df, tmp_path
+
+
+def test_build_feature_frame_cache(monkeypatch, storage):
+    df, tmp_path = storage
+
+    built = build_feature_frame(min_products=2)
+    load_dataset = Mock(side_effect=AssertionError("cache missed"))
+    monkeypatch.setattr("module_3.utils.load_dataset", load_dataset)
+    cached = build_feature_frame(min_products=2)
+
+    pd.testing.assert_frame_equal(built, cached)
+    assert list(built.order_id.unique()) == [2]
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+    monkeypatch.setattr("module_3.utils.load_dataset", Mock(return_value=df))
+    build_feature_frame(min_products=3)
+
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 2
+
+
+def test_build_feature_frame_cache_invalidated_by_new_csv(monkeypatch, storage):
+    df, tmp_path = storage
+    build_feature_frame(min_products=2)
+
+    df.iloc[:4].to_csv(tmp_path / "feature_frame.csv", index=False)
+    rebuilt = build_feature_frame(min_products=2)
+
+    assert len(rebuilt) == 2
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+
+def test_iter_feature_frame_reads_cache(monkeypatch, storage):
+    built = build_feature_frame(min_products=2)
+    monkeypatch.setattr(
+        "module_3.utils.pd.read_csv",
+        lambda *args, **kwargs: pytest.fail("CSV parsed despite the cache"),
+    )
+
+    chunks = list(iter_feature_frame(min_products=2, chunksize=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), built)
+
+
+def test_source_hash_only_rehashes_changed_csv(monkeypatch, storage):
+    _, tmp_path = storage
+    csv = str(tmp_path / "feature_frame.csv")
+    source_hash = get_source_hash(csv)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            "module_3.utils.hashlib.file_digest",
+            Mock(side_effect=AssertionError("rehashed")),
+        )
+        assert get_source_hash(csv) == source_hash
+
+    (tmp_path / "feature_frame.csv").write_text("order_id\n22\n")
+
+    assert get_source_hash(csv) != source_hash
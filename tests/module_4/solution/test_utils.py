@@ -0,0 +1,60 @@
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from module_4.solution.utils import get_source_hash, load_training_feature_frame
+
+
+@pytest.fixture
+def data_path(monkeypatch, tmp_path):
+    pd.DataFrame({
+        "order_id": [1, 1, 2, 2, 2],
+        "created_at": ["2023-01-01 10:00:00"] * 2 + ["2023-01-02 11:00:00"] * 3,
+        "order_date": ["2023-01-01 00:00:00"] * 2 + ["2023-01-02 00:00:00"] * 3,
+    }).to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_4.solution.utils.DATA_PATH", tmp_path)
+    monkeypatch.setattr("module_4.solution.utils.CACHE_PATH", tmp_path / "cache")
+    return tmp_path
+
+
+def test_load_training_feature_frame_cache(monkeypatch, data_path):
+    built = load_training_feature_frame(min_products=3)
+    monkeypatch.setattr(
+        "module_4.solution.utils.load_raw_dataset",
+        Mock(side_effect=AssertionError("cache missed")),
+    )
+    cached = load_training_feature_frame(min_products=3)
+
+    pd.testing.assert_frame_equal(built, cached)
+    assert list(built.order_id.unique()) == [2]
+    assert len(list((data_path / "cache").glob("*.parquet"))) == 1
+
+
+def test_load_training_feature_frame_cache_invalidated_by_new_csv(data_path):
+    load_training_feature_frame(min_products=2)
+
+    (data_path / "feature_frame.csv").write_text(
+        "order_id,created_at,order_date\n"
+        "3,2023-01-03 10:00:00,2023-01-03 00:00:00\n"
+        "3,2023-01-03 10:00:00,2023-01-03 00:00:00\n"
+    )
+    rebuilt = load_training_feature_frame(min_products=2)
+
+    assert list(rebuilt.order_id.unique()) == [3]
+    assert len(list((data_path / "cache").glob("*.parquet"))) == 1
+
+
+def test_source_hash_only_rehashes_changed_csv(monkeypatch, data_path):
+    csv = data_path / "feature_frame.csv"
+    source_hash = get_source_hash(csv)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            "module_4.solution.utils.hashlib.file_digest",
+            Mock(side_effect=AssertionError("rehashed")),
+        )
+        assert get_source_hash(csv) == source_hash
+
+    csv.write_text("order_id\n22\n")
+
+    assert get_source_hash(csv) != source_hash
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from module_4.solution import push_model
+from module_4.solution.push_model import PushModel
+
+
+@pytest.fixture
+def fitted_model():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((600, len(PushModel.MODEL_COLUMNS))),
+        columns=PushModel.MODEL_COLUMNS,
+    )
+    df[PushModel.TARGET_COLUMN] = (df["global_popularity"] > 0.7).astype(int)
+
+    model = PushModel({"n_estimators": 5, "max_depth": 2}, {"cv": 2}, 0.5)
+    model.fit(df)
+    return model, df
+
+
+def test_predict_proba_parallel_matches_serial(fitted_model, monkeypatch):
+    model, df = fitted_model
+    df = df.sample(frac=1, random_state=0)
+    df.index = df.index + 1000
+    monkeypatch.setattr(push_model, "MIN_SHARD_SIZE", 100)
+
+    expected = model.predict_proba(df)
+    predictions = model.predict_proba(df, n_jobs=3)
+
+    pd.testing.assert_series_equal(predictions, expected)
+
+
+def test_predict_proba_parallel_shares_model_instead_of_pickling_it(
+    fitted_model, monkeypatch
+):
+    model, df = fitted_model
+    monkeypatch.setattr(push_model, "MIN_SHARD_SIZE", 100)
+    tasks = []
+
+    def in_process(n_jobs, max_nbytes):
+        def run(calls):
+            tasks.extend(calls)
+            return [func(*args, **kwargs) for func, args, kwargs in tasks]
+        return run
+
+    monkeypatch.setattr(push_model, "Parallel", in_process)
+    predictions = model.predict_proba(df, n_jobs=3)
+
+    assert len(tasks) == 3
+    assert not any(
+        isinstance(arg, push_model.BaseEstimator)
+        for _, args, _ in tasks
+        for arg in args
+    )
+    pd.testing.assert_series_equal(predictions, model.predict_proba(df))
+
+
+def test_predict_proba_small_frame_stays_in_process(fitted_model, monkeypatch):
+    model, df = fitted_model
+    monkeypatch.setattr(
+        model, "_predict_proba_parallel", lambda *args: pytest.fail("parallel")
+    )
+
+    predictions = model.predict(df.iloc[:50], n_jobs=4)
+
+    assert predictions.index.equals(df.index[:50])
+
+
+@pytest.mark.parametrize(
+    "backend, parameters",
+    [
+        ("gradient_boosting", {"n_estimators": 5}),
+        ("hist_gradient_boosting", {"max_iter": 5}),
+        ("lightgbm", {"n_estimators": 5, "min_child_samples": 5}),
+    ],
+)
+def test_push_model_backends(backend, parameters, fitted_model):
+    if backend == "lightgbm":
+        pytest.importorskip("lightgbm")
+    _, df = fitted_model
+
+    model = PushModel({"backend": backend, **parameters}, {"cv": 2}, 0.5)
+    model.fit(df)
+    predictions = model.predict_proba(df)
+
+    assert model.backend == backend
+    assert predictions.between(0, 1).all()
+    assert predictions[df[PushModel.TARGET_COLUMN] == 1].mean() > predictions.mean()
+
+
+def test_push_model_unknown_backend():
+    with pytest.raises(ValueError):
+        PushModel({"backend": "xgboost"}, {}, 0.5)
+
+
+def test_fit_parallel_matches_serial(fitted_model):
+    serial_model, df = fitted_model
+
+    model = PushModel({"n_estimators": 5, "max_depth": 2}, {"cv": 2, "n_jobs": 2}, 0.5)
+    model.fit(df)
+
+    assert model.clf.n_jobs == 2
+    pd.testing.assert_series_equal(
+        model.predict_proba(df), serial_model.predict_proba(df)
+    )
+
+
+def test_get_calibration_n_jobs(monkeypatch):
+    monkeypatch.setattr(push_model, "effective_n_jobs", lambda n_jobs: 8)
+    monkeypatch.setattr(push_model, "get_available_memory", lambda: 1000)
+
+    assert push_model.get_calibration_n_jobs(-1, 3, 100) == 3
+    assert push_model.get_calibration_n_jobs(-1, 5, 400) == 2
+    assert push_model.get_calibration_n_jobs(-1, 5, 2000) == 1
+
+    monkeypatch.setattr(push_model, "get_available_memory", lambda: None)
+    assert push_model.get_calibration_n_jobs(-1, 5, 2000) == 5
@@ -1,8 +1,14 @@
+import pytest
 import pandas as pd
+from unittest.mock import Mock
 from module_4.utils import (
     get_feature_cols,
+    get_source_hash,
     push_relevant_orders,
     build_feature_frame,
+    iter_feature_frame,
+    load_dataset,
+    save_predictions,
     INFO_COLS,
     CATEGORICAL_COLS,
     LABEL_COL
@@ -52,12 +58,181 @@ def test_build_feature_frame(monkeypatch):
     }
     df = pd.DataFrame(data)
     
-    monkeypatch.setattr('module_4.utils.load_dataset', lambda: df)
+    monkeypatch.setattr('module_4.utils.load_dataset', lambda columns: df)
     
-    df = build_feature_frame()
+    df = build_feature_frame(use_cache=False)
 
     expected_columns = ["created_at", "order_date"]
     assert all(col in df.columns for col in expected_columns)
     
     assert pd.api.types.is_datetime64_any_dtype(df["created_at"])
-    assert pd.api.types.is_object_dtype(df["order_date"])
\ No newline at end of file
+    assert pd.api.types.is_object_dtype(df["order_date"])
+
+
+def test_load_dataset_dtypes(monkeypatch, tmp_path):
+    df = pd.DataFrame({
+        "variant_id": [33826472919172, 33826472919172, 34081589887108],
+        "product_type": ["ricepastapulses", "ricepastapulses", "tinspackagedfoods"],
+        "order_id": [2807985930372, 2808027644036, 2808027644036],
+        "user_id": [3482464092292, 3466586718340, 3466586718340],
+        "created_at": ["2020-10-05 16:46:19"] * 3,
+        "order_date": ["2020-10-05 00:00:00"] * 3,
+        LABEL_COL: [0.0, 1.0, 0.0],
+        "ordered_before": [0.0, 1.0, 0.0],
+        "vendor": ["clearspring", "clearspring", "biona"],
+        "global_popularity": [0.0, 0.0125, 0.0],
+        "count_adults": [2.0, 2.0, 1.0],
+    })
+    df.to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_4.utils.STORAGE_PATH", str(tmp_path))
+
+    loaded = load_dataset()
+
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded["variant_id"].dtype == "int64"
+    assert loaded[LABEL_COL].dtype == "int8"
+    assert loaded["ordered_before"].dtype == "int8"
+    assert isinstance(loaded["vendor"].dtype, pd.CategoricalDtype)
+    assert loaded["global_popularity"].dtype == "float32"
+    assert loaded["ordered_before"].tolist() == [0, 1, 0]
+
+    loaded = load_dataset(["global_popularity"])
+
+    assert list(loaded.columns) == [
+        "variant_id", "order_id", "user_id", "created_at", "order_date",
+        LABEL_COL, "global_popularity",
+    ]
+
+
+def test_build_feature_frame_cache(monkeypatch, tmp_path):
+    df = pd.DataFrame({
+        "variant_id": [1, 1, 2, 2, 3, 3],
+        "vendor": ["a", "b", "a", "b", "a", "b"],
+        "order_id": [1, 1, 2, 2, 2, 2],
+        "user_id": [7, 7, 8, 8, 8, 8],
+        "created_at": ["2023-01-01 10:00:00"] * 2 + ["2023-01-02 11:00:00"] * 4,
+        "order_date": ["2023-01-01 00:00:00"] * 2 + ["2023-01-02 00:00:00"] * 4,
+        LABEL_COL: [1.0, 0.0, 1.0, 1.0, 1.0, 0.0],
+        "global_popularity": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+    })
+    df.to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_4.utils.STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "module_4.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+
+    built = build_feature_frame(min_products=2)
+    monkeypatch.setattr("module_4.utils.load_dataset", Mock())
+    cached = build_feature_frame(min_products=2)
+
+    pd.testing.assert_frame_equal(built, cached)
+    assert list(built.order_id.unique()) == [2]
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+    df.iloc[:4].to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.undo()
+    monkeypatch.setattr("module_4.utils.STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "module_4.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+
+    rebuilt = build_feature_frame(min_products=2)
+
+    assert len(rebuilt) == 2
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+
+def test_iter_feature_frame_matches_build_feature_frame(monkeypatch, tmp_path):
+    df = pd.DataFrame({
+        "variant_id": range(12),
+        "vendor": ["a", "b", "c"] * 4,
+        "order_id": [1, 2, 3] * 4,
+        "user_id": [7, 8, 9] * 4,
+        "created_at": ["2023-01-01 10:00:00"] * 12,
+        "order_date": ["2023-01-01 00:00:00"] * 12,
+        LABEL_COL: [1.0, 1.0, 0.0] * 4,
+        "global_popularity": [i / 10 for i in range(12)],
+    })
+    df.to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_4.utils.STORAGE_PATH", str(tmp_path))
+
+    chunks = list(iter_feature_frame(min_products=3, chunksize=5, use_cache=False))
+    expected = build_feature_frame(min_products=3, use_cache=False)
+
+    assert [len(chunk) for chunk in chunks] == [4, 3, 1]
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks).astype({"vendor": object}),
+        expected.astype({"vendor": object}),
+    )
+
+
+def test_iter_feature_frame_skips_empty_chunks_and_reads_cache(
+    monkeypatch, tmp_path
+):
+    df = pd.DataFrame({
+        "variant_id": range(12),
+        "vendor": ["a", "b", "c"] * 4,
+        "order_id": [1] * 4 + [2] * 4 + [1] * 4,
+        "user_id": [7] * 12,
+        "created_at": ["2023-01-01 10:00:00"] * 12,
+        "order_date": ["2023-01-01 00:00:00"] * 12,
+        LABEL_COL: [1.0] * 4 + [0.0] * 4 + [1.0] * 4,
+        "global_popularity": [i / 10 for i in range(12)],
+    })
+    df.to_csv(tmp_path / "feature_frame.csv", index=False)
+    monkeypatch.setattr("module_4.utils.STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "module_4.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+
+    chunks = list(iter_feature_frame(min_products=5, chunksize=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4]
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+    monkeypatch.setattr(
+        "module_4.utils.pd.read_csv",
+        lambda *args, **kwargs: pytest.fail("CSV parsed despite the cache"),
+    )
+    cached_chunks = list(iter_feature_frame(min_products=5, chunksize=4))
+
+    assert [len(chunk) for chunk in cached_chunks] == [4, 4]
+    pd.testing.assert_frame_equal(pd.concat(cached_chunks), pd.concat(chunks))
+    pd.testing.assert_frame_equal(
+        build_feature_frame(min_products=5), pd.concat(chunks)
+    )
+
+
+def test_save_predictions_appends(monkeypatch, tmp_path):
+    monkeypatch.setattr("module_4.utils.PREDICTIONS_PATH", str(tmp_path))
+    df = pd.DataFrame({"order_id": [1, 2], "user_id": [3, 4], "variant_id": [5, 6]})
+    date = "2025-01-01 00:00:00"
+
+    save_predictions([0, 1], [0.1, 0.9], "model", df, date)
+    save_predictions([1, 0], [0.8, 0.2], "model", df, date, mode="a")
+
+    predictions = pd.read_csv(tmp_path / "model_2025-01-01 00-00-00.csv")
+    assert predictions["y_pred"].tolist() == [0.1, 0.9, 0.8, 0.2]
+    assert (predictions["date"] == date).all()
+
+
+def test_source_hash_only_rehashes_changed_csv(monkeypatch, tmp_path):
+    csv = tmp_path / "feature_frame.csv"
+    csv.write_text("order_id\n1\n")
+    monkeypatch.setattr(
+        "module_4.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+    source_hash = get_source_hash(str(csv))
+
+    file_digest = Mock(side_effect=AssertionError("rehashed"))
+    monkeypatch.setattr("module_4.utils.hashlib.file_digest", file_digest)
+
+    assert get_source_hash(str(csv)) == source_hash
+
+    csv.write_text("order_id\n22\n")
+    monkeypatch.undo()
+    monkeypatch.setattr(
+        "module_4.utils.FEATURE_FRAME_CACHE_PATH", str(tmp_path / "cache")
+    )
+
+    assert get_source_hash(str(csv)) != source_hash
@@ -0,0 +1,11 @@
+import os
+import sys
+
+
+# The solution API imports its modules relative to its own directory.
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../../../src/module_6/solution")
+    ),
+)
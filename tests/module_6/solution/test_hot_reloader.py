@@ -0,0 +1,26 @@
+from unittest.mock import Mock
+
+from basket_model.hot_reloader import HotReloader
+
+
+def test_reload_swaps_components_and_records_duration():
+    metrics = Mock()
+    versions = iter(["v1", "v2"])
+    reloader = HotReloader(metrics, load=lambda: next(versions), fingerprint=lambda: 0)
+
+    assert reloader.reload_in_background()
+    reloader.reload_thread.join()
+
+    assert reloader.current() == "v2"
+    metrics.observe_reload_duration.assert_called_once()
+
+
+def test_failed_reload_keeps_current_components():
+    metrics = Mock()
+    versions = iter(["v1"])
+    reloader = HotReloader(metrics, load=lambda: next(versions), fingerprint=lambda: 0)
+
+    reloader.reload()
+
+    assert reloader.current() == "v1"
+    metrics.increase_reload_errors.assert_called_once()
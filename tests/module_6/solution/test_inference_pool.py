@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+from basket_model.inference_pool import InferencePool
+from exceptions import ServiceOverloadedException
+
+
+def test_inference_pool_rejects_calls_beyond_workers_and_queue():
+    pool = InferencePool(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    async def run():
+        admitted = [
+            asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+
+        with pytest.raises(ServiceOverloadedException):
+            await pool.run(release.wait)
+
+        release.set()
+        return await asyncio.gather(*admitted)
+
+    assert asyncio.run(run()) == [True, True]
+    assert pool.pending == 0
+
+
+def test_inference_pool_admits_again_once_calls_finish():
+    pool = InferencePool(max_workers=1, max_queue_size=0)
+
+    async def run():
+        return [await pool.run(lambda x: x * 2, i) for i in range(3)]
+
+    assert asyncio.run(run()) == [0, 2, 4]
+    assert pool.pending == 0
+
+
+def test_inference_pool_releases_slot_when_call_fails():
+    pool = InferencePool(max_workers=1, max_queue_size=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run(fail))
+
+    assert pool.pending == 0
+
+
+def test_inference_pool_without_workers_runs_inline():
+    pool = InferencePool(max_workers=0, max_queue_size=0)
+
+    async def run():
+        return await pool.run(threading.get_ident)
+
+    assert pool.executor is None
+    assert asyncio.run(run()) == threading.get_ident()
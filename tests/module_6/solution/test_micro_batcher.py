@@ -0,0 +1,156 @@
+import asyncio
+from time import time
+
+import numpy as np
+import pytest
+from basket_model.micro_batcher import MicroBatcher
+from exceptions import PredictionException, ServiceOverloadedException
+
+
+class FakeModel:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def predict(self, features):
+        self.calls.append(len(features))
+        if self.error is not None:
+            raise self.error
+        return features[:, 0] * 2
+
+
+def run_batch(batcher, model, features_list):
+    async def run():
+        return await asyncio.gather(
+            *[batcher.predict(model, features) for features in features_list],
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run())
+
+
+def test_micro_batcher_flushes_on_max_batch_size(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_batch_size=3, max_wait_ms=60_000)
+
+    run_batch(batcher, model, [np.ones((1, 4))] * 3)
+
+    assert model.calls == [3]
+
+
+def test_micro_batcher_flushes_on_timeout(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_batch_size=100, max_wait_ms=10)
+
+    run_batch(batcher, model, [np.ones((1, 4))] * 2)
+
+    assert model.calls == [2]
+
+
+def test_micro_batcher_returns_each_request_its_own_rows(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+    features_list = [
+        np.full((2, 4), 1.0),
+        np.full((1, 4), 2.0),
+        np.full((3, 4), 3.0),
+    ]
+
+    predictions = run_batch(batcher, model, features_list)
+
+    assert model.calls == [6]
+    for features, prediction in zip(features_list, predictions):
+        np.testing.assert_array_equal(prediction, features[:, 0] * 2)
+
+
+def test_micro_batcher_sets_batch_errors_on_every_request(mocker):
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+
+    results = run_batch(
+        batcher, FakeModel(RuntimeError("boom")), [np.ones((1, 4))] * 2
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_micro_batcher_retries_failed_batch_one_by_one(mocker):
+    class PartiallyFailingModel(FakeModel):
+        def predict(self, features):
+            self.calls.append(len(features))
+            if np.isnan(features).any():
+                raise PredictionException("nan features")
+            return features[:, 0] * 2
+
+    model = PartiallyFailingModel()
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+
+    good, bad = run_batch(
+        batcher, model, [np.ones((1, 4)), np.full((1, 4), np.nan)]
+    )
+
+    np.testing.assert_array_equal(good, [2.0])
+    assert isinstance(bad, PredictionException)
+    assert model.calls == [2, 1, 1]
+
+
+def test_micro_batcher_runs_model_off_the_event_loop(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+    spy = mocker.spy(batcher.inference_pool.executor, "submit")
+
+    run_batch(batcher, model, [np.ones((1, 4))])
+
+    assert spy.call_count == 1
+    assert model.calls == [1]
+
+
+def test_micro_batcher_keeps_queued_requests_when_worker_restarts(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+
+    async def run():
+        batcher._ensure_worker()
+        batcher.worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batcher.worker
+        queued = asyncio.get_running_loop().create_future()
+        batcher.queue.put_nowait((model, np.ones((1, 4)), queued, time()))
+        restarted = asyncio.ensure_future(batcher.predict(model, np.ones((1, 4))))
+        return await asyncio.wait_for(asyncio.gather(queued, restarted), 1)
+
+    for prediction in asyncio.run(run()):
+        np.testing.assert_array_equal(prediction, [2.0])
+
+
+def test_micro_batcher_rejects_requests_beyond_queue_size(mocker):
+    model = FakeModel()
+    batcher = MicroBatcher(
+        mocker.Mock(),
+        max_batch_size=2,
+        max_wait_ms=10,
+        max_queue_size=3,
+    )
+
+    results = run_batch(batcher, model, [np.ones((1, 4))] * 4)
+
+    assert isinstance(results[3], ServiceOverloadedException)
+    assert all(isinstance(result, np.ndarray) for result in results[:3])
+    assert model.calls == [2, 1]
+
+
+def test_micro_batcher_scores_each_request_with_its_own_model(mocker):
+    old_model, new_model = FakeModel(), FakeModel()
+    batcher = MicroBatcher(mocker.Mock(), max_wait_ms=10)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.predict(old_model, np.ones((2, 4))),
+            batcher.predict(new_model, np.ones((1, 4))),
+            batcher.predict(old_model, np.ones((1, 4))),
+        )
+
+    predictions = asyncio.run(run())
+
+    assert old_model.calls == [3]
+    assert new_model.calls == [1]
+    assert [len(prediction) for prediction in predictions] == [2, 1, 1]
@@ -0,0 +1,76 @@
+from basket_model import prediction_cache
+from basket_model.prediction_cache import PredictionCache
+
+
+VERSIONS = ("model_v1", "features_v1")
+
+
+def test_prediction_cache_hit_and_miss(mocker):
+    cache = PredictionCache(mocker.Mock())
+
+    assert cache.get("a", VERSIONS) is None
+    cache.put("a", VERSIONS, 10.0)
+
+    assert cache.get("a", VERSIONS) == 10.0
+    cache.metrics.increase_prediction_cache_misses.assert_called_once()
+    cache.metrics.increase_prediction_cache_hits.assert_called_once()
+
+
+def test_prediction_cache_evicts_least_recently_used(mocker):
+    cache = PredictionCache(mocker.Mock(), max_size=2)
+    cache.get("a", VERSIONS)
+    cache.put("a", VERSIONS, 1.0)
+    cache.put("b", VERSIONS, 2.0)
+
+    cache.get("a", VERSIONS)
+    cache.put("c", VERSIONS, 3.0)
+
+    assert cache.get("b", VERSIONS) is None
+    assert cache.get("a", VERSIONS) == 1.0
+    assert cache.get("c", VERSIONS) == 3.0
+    cache.metrics.increase_prediction_cache_evictions.assert_called_once()
+
+
+def test_prediction_cache_expires_entries_after_ttl(mocker):
+    now = [100.0]
+    mocker.patch.object(prediction_cache, "monotonic", lambda: now[0])
+    cache = PredictionCache(mocker.Mock(), ttl_seconds=5)
+    cache.get("a", VERSIONS)
+    cache.put("a", VERSIONS, 1.0)
+
+    now[0] += 4
+    assert cache.get("a", VERSIONS) == 1.0
+    now[0] += 2
+    assert cache.get("a", VERSIONS) is None
+
+
+def test_prediction_cache_is_invalidated_on_reload(mocker):
+    cache = PredictionCache(mocker.Mock())
+    cache.get("a", VERSIONS)
+    cache.put("a", VERSIONS, 1.0)
+
+    new_versions = ("model_v2", "features_v1")
+
+    assert cache.get("a", new_versions) is None
+    assert len(cache.entries) == 0
+
+
+def test_prediction_cache_drops_put_from_before_reload(mocker):
+    cache = PredictionCache(mocker.Mock())
+    new_versions = ("model_v2", "features_v1")
+    cache.get("a", VERSIONS)
+    cache.get("b", new_versions)
+    cache.put("b", new_versions, 2.0)
+
+    cache.put("a", VERSIONS, 1.0)
+
+    assert cache.versions == new_versions
+    assert cache.get("b", new_versions) == 2.0
+    assert cache.get("a", new_versions) is None
+
+
+def test_prediction_cache_disabled(mocker):
+    cache = PredictionCache(mocker.Mock(), max_size=0)
+    cache.put("a", VERSIONS, 1.0)
+
+    assert cache.get("a", VERSIONS) is None
@@ -0,0 +1,25 @@
+import sys
+
+from fastapi.testclient import TestClient
+import config
+from routes import create_app
+
+
+def test_switch_interval_only_set_while_the_app_runs(monkeypatch):
+    monkeypatch.setattr(config, "INFERENCE_POOL_SIZE", 1)
+    monkeypatch.setattr(config, "INFERENCE_SWITCH_INTERVAL_MS", 0.5)
+    switch_interval = sys.getswitchinterval()
+
+    with TestClient(create_app()):
+        assert sys.getswitchinterval() == 0.0005
+
+    assert sys.getswitchinterval() == switch_interval
+
+
+def test_switch_interval_untouched_with_inline_inference(monkeypatch):
+    monkeypatch.setattr(config, "INFERENCE_POOL_SIZE", 0)
+    monkeypatch.setattr(config, "MICRO_BATCHING", False)
+    switch_interval = sys.getswitchinterval()
+
+    with TestClient(create_app()):
+        assert sys.getswitchinterval() == switch_interval
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+import pytest
+from module_6.basket_model.exceptions.exceptions import UserNotFoundException
+from module_6.basket_model.services.feature_store import FeatureStore
+from module_6.basket_model.utils import snapshot
+
+
+@pytest.fixture
+def feature_frame():
+    return pd.DataFrame({
+        "user_id": ["b", "a", "b", "c", "b"],
+        "created_at": pd.to_datetime(
+            ["2021-01-01", "2021-01-02", "2021-01-03", "2021-01-04", "2021-01-05"]
+        ),
+        "basket_value": [10.0, 20.0, 30.0, 40.0, 50.0],
+        "regulars_count": [0, 1, 2, 3, 4],
+        "prior_item_count": [1, 2, 3, 4, 5],
+        "prior_regulars_count": [5, 4, 3, 2, 1],
+        "prior_basket_value": [1.5, 2.5, 3.5, 4.5, 5.5],
+    })
+
+
+def test_snapshot_round_trip(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+
+    user_ids, offsets, features = snapshot.open_snapshot(str(tmp_path))
+
+    assert isinstance(features, np.memmap)
+    np.testing.assert_array_equal(user_ids, ["a", "b", "c"])
+    np.testing.assert_array_equal(offsets, [0, 1, 4, 5])
+    assert snapshot.load_snapshot_metadata(str(tmp_path))["n_rows"] == 5
+
+
+def test_feature_store_matches_feature_frame(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+    feature_store = FeatureStore(str(tmp_path))
+
+    expected = feature_frame.set_index("user_id").loc[["b"], snapshot.FEATURE_COLS]
+    features = feature_store.get_features("b")
+
+    np.testing.assert_array_equal(features, expected.to_numpy(dtype=float))
+
+
+def test_feature_store_single_order_user_is_2d(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+    feature_store = FeatureStore(str(tmp_path))
+
+    features = feature_store.get_features("a")
+
+    assert features.shape == (1, len(snapshot.FEATURE_COLS))
+    assert features.dtype == np.float64
+
+
+def test_feature_store_user_not_found(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+    feature_store = FeatureStore(str(tmp_path))
+
+    with pytest.raises(UserNotFoundException):
+        feature_store.get_features("z")
+
+
+def test_feature_store_get_features_batch(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+    feature_store = FeatureStore(str(tmp_path))
+
+    user_ids, row_counts, features = feature_store.get_features_batch(
+        ["c", "z", "b", "a"]
+    )
+
+    assert user_ids == ["c", "b", "a"]
+    np.testing.assert_array_equal(row_counts, [1, 3, 1])
+    np.testing.assert_array_equal(
+        features,
+        np.vstack([feature_store.get_features(user_id) for user_id in user_ids]),
+    )
+
+
+def test_write_snapshot_switches_current_version(feature_frame, tmp_path):
+    snapshot.write_snapshot(feature_frame, str(tmp_path))
+    first_version = snapshot.load_snapshot_metadata(str(tmp_path))["version"]
+    feature_store = FeatureStore(str(tmp_path))
+
+    snapshot.write_snapshot(feature_frame.iloc[:2], str(tmp_path))
+    snapshot.write_snapshot(feature_frame.iloc[:1], str(tmp_path))
+
+    assert snapshot.load_snapshot_metadata(str(tmp_path))["n_rows"] == 1
+    assert feature_store.version == first_version
+    assert feature_store.get_features("b").shape == (3, 4)
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 2
+
+
+@pytest.fixture
+def delta_storage(mocker, tmp_path):
+    rng = np.random.default_rng(0)
+    users = [f"user_{i}" for i in range(10)]
+    orders = pd.DataFrame({
+        "id": np.arange(90),
+        "user_id": rng.choice(users, size=90),
+        "created_at": pd.Timestamp("2021-01-01")
+        + pd.to_timedelta(np.arange(90), unit="h"),
+        "ordered_items": [
+            rng.integers(0, 20, size=rng.integers(1, 6)) for _ in range(90)
+        ],
+    })
+    regulars = pd.DataFrame({
+        "user_id": rng.choice(users, size=30),
+        "variant_id": rng.integers(0, 20, size=30),
+    })
+    storage = tmp_path / "storage"
+    storage.mkdir()
+    mocker.patch.object(snapshot.loaders, "STORAGE", str(storage))
+    orders.iloc[:50].to_parquet(storage / "orders.parquet", index=False)
+    regulars.iloc[:10].to_parquet(storage / "regulars.parquet", index=False)
+    pd.DataFrame({"variant_id": np.arange(20), "price": np.arange(20.0)}).to_parquet(
+        storage / "inventory.parquet", index=False
+    )
+    snapshot_path = str(tmp_path / "snapshot")
+    snapshot.rebuild_snapshot(snapshot_path)
+    return orders, regulars, storage, snapshot_path
+
+
+def test_consecutive_snapshot_updates_match_full_rebuild(delta_storage, tmp_path):
+    orders, regulars, storage, snapshot_path = delta_storage
+    sources = {
+        path.name: path.read_bytes() for path in storage.glob("*.parquet")
+    }
+
+    snapshot.update_snapshot(
+        orders.iloc[50:70].drop(columns="id"), regulars.iloc[10:20], "1", snapshot_path
+    )
+    snapshot.update_snapshot(
+        orders.iloc[70:].drop(columns="id"), regulars.iloc[20:], "2", snapshot_path
+    )
+
+    rebuilt_path = str(tmp_path / "rebuilt")
+    snapshot.rebuild_snapshot(rebuilt_path)
+
+    assert {
+        path.name: path.read_bytes() for path in storage.glob("*.parquet")
+    } == sources
+    assert snapshot.loaders.list_batches() == ["1", "2"]
+    assert len(snapshot.loaders.load_orders()) == len(orders)
+    pd.testing.assert_frame_equal(
+        snapshot.read_snapshot_frame(snapshot_path),
+        snapshot.read_snapshot_frame(rebuilt_path),
+    )
+
+
+def test_replayed_snapshot_update_is_a_no_op(delta_storage):
+    orders, regulars, _, snapshot_path = delta_storage
+    new_orders = orders.iloc[50:].drop(columns="id")
+
+    updated = snapshot.update_snapshot(
+        new_orders, regulars.iloc[10:], "1", snapshot_path
+    )
+    replayed = snapshot.update_snapshot(
+        new_orders, regulars.iloc[10:], "1", snapshot_path
+    )
+
+    assert replayed == updated
+    assert len(snapshot.loaders.load_orders()) == len(orders)
+
+
+def test_update_of_stored_batch_missing_from_snapshot(delta_storage, tmp_path):
+    orders, regulars, _, snapshot_path = delta_storage
+    new_orders = orders.iloc[50:].drop(columns="id")
+    snapshot.loaders.store_delta("1", new_orders, regulars.iloc[10:])
+
+    snapshot.update_snapshot(new_orders, regulars.iloc[10:], "1", snapshot_path)
+
+    rebuilt_path = str(tmp_path / "rebuilt")
+    snapshot.rebuild_snapshot(rebuilt_path)
+    pd.testing.assert_frame_equal(
+        snapshot.read_snapshot_frame(snapshot_path),
+        snapshot.read_snapshot_frame(rebuilt_path),
+    )
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from module_6.basket_model.utils.features import (
+    build_feature_frame,
+    count_regulars_in_order,
+    count_regulars_in_orders,
+    update_feature_frame,
+)
+from module_6.basket_model.utils.loaders import prepare_orders
+
+
+def count_regulars_in_orders_row_by_row(
+    orders: pd.DataFrame, regulars: pd.DataFrame
+) -> np.ndarray:
+    counts = []
+    for _, order in orders.iterrows():
+        user_regulars = regulars.loc[lambda x: x.user_id == order.user_id]
+        counts += [count_regulars_in_order(order, user_regulars)]
+    return np.array(counts)
+
+
+def sample_orders_and_regulars(seed: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    users = [f"user_{i}" for i in range(20)]
+    variants = np.arange(1000, 1040)
+
+    orders = pd.DataFrame({
+        "user_id": rng.choice(users, size=200),
+        "ordered_items": [
+            rng.choice(variants, size=rng.integers(0, 12)) for _ in range(200)
+        ],
+    })
+    orders.index = rng.permutation(np.arange(500, 700))
+
+    regulars = pd.DataFrame({
+        "user_id": rng.choice(users[:15], size=150),
+        "variant_id": rng.choice(variants, size=150),
+    })
+    return orders, regulars
+
+
+def test_count_regulars_in_orders_matches_row_by_row():
+    for seed in range(5):
+        orders, regulars = sample_orders_and_regulars(seed)
+
+        expected = count_regulars_in_orders_row_by_row(orders, regulars)
+        counts = count_regulars_in_orders(orders, regulars)
+
+        np.testing.assert_array_equal(counts, expected)
+
+
+def test_count_regulars_in_orders_without_matches():
+    orders = pd.DataFrame({
+        "user_id": ["a", "b"],
+        "ordered_items": [[1, 2], []],
+    })
+    regulars = pd.DataFrame({"user_id": ["b"], "variant_id": [1]})
+
+    counts = count_regulars_in_orders(orders, regulars)
+
+    np.testing.assert_array_equal(counts, np.array([0, 0]))
+
+
+def test_update_feature_frame_matches_full_rebuild():
+    orders, regulars = sample_orders_and_regulars(0)
+    orders = orders.assign(
+        created_at=pd.Timestamp("2021-01-01")
+        + pd.to_timedelta(np.arange(len(orders)), unit="h")
+    ).reset_index(drop=True)
+    history_orders, new_orders = orders.iloc[:150], orders.iloc[150:]
+    history_regulars, new_regulars = regulars.iloc[:120], regulars.iloc[120:]
+    mean_item_price = 2.5
+
+    history_frame = build_feature_frame(
+        prepare_orders(history_orders), history_regulars, mean_item_price
+    )
+    updated = update_feature_frame(
+        history_frame,
+        prepare_orders(history_orders),
+        history_regulars,
+        new_orders,
+        new_regulars,
+        mean_item_price,
+    )
+    rebuilt = build_feature_frame(prepare_orders(orders), regulars, mean_item_price)
+
+    pd.testing.assert_frame_equal(
+        updated.sort_values(["user_id", "created_at"]).reset_index(drop=True),
+        rebuilt.sort_values(["user_id", "created_at"]).reset_index(drop=True),
+    )
@@ -0,0 +1,45 @@
+from module_6.basket_model.services.hot_reloader import HotReloader
+
+
+def test_reload_swaps_components():
+    versions = iter(["v1", "v2"])
+    reloader = HotReloader(load=lambda: next(versions), fingerprint=lambda: 0)
+
+    assert reloader.current() == "v1"
+
+    assert reloader.reload_in_background()
+    reloader.reload_thread.join()
+
+    assert reloader.current() == "v2"
+
+
+def test_failed_reload_keeps_current_components():
+    def load():
+        if reloader_loaded:
+            raise FileNotFoundError("model.joblib")
+        reloader_loaded.append(True)
+        return "v1"
+
+    reloader_loaded = []
+    reloader = HotReloader(load=load, fingerprint=lambda: 0)
+
+    reloader.reload()
+
+    assert reloader.current() == "v1"
+
+
+def test_reload_records_metrics(mocker):
+    versions = iter(["v1", "v2"])
+    reload_duration, reload_errors = mocker.Mock(), mocker.Mock()
+    reloader = HotReloader(
+        load=lambda: next(versions),
+        fingerprint=lambda: 0,
+        reload_duration=reload_duration,
+        reload_errors=reload_errors,
+    )
+
+    reloader.reload()
+    reloader.reload()
+
+    reload_duration.observe.assert_called_once()
+    reload_errors.inc.assert_called_once()
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from module_6.basket_model.utils import loaders
+
+
+def load_orders_row_by_row(path: str) -> pd.DataFrame:
+    orders = pd.read_parquet(path, columns=loaders.ORDER_COLUMNS)
+    orders = orders.sort_values(by=["user_id", "created_at"])
+    orders["item_count"] = orders.apply(lambda x: len(x.ordered_items), axis=1)
+    orders["user_order_seq"] = (
+        orders.groupby(["user_id"])["created_at"].rank().astype(int)
+    )
+    return orders
+
+
+@pytest.fixture
+def orders_storage(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    n_orders = 500
+    orders = pd.DataFrame({
+        "id": np.arange(n_orders),
+        "user_id": rng.choice([f"user_{i}" for i in range(40)], size=n_orders),
+        "created_at": pd.Timestamp("2021-01-01")
+        + pd.to_timedelta(rng.integers(0, 50, size=n_orders), unit="D"),
+        "ordered_items": [
+            rng.integers(0, 100, size=rng.integers(0, 15)) for _ in range(n_orders)
+        ],
+    })
+    orders.to_parquet(tmp_path / "orders.parquet")
+    monkeypatch.setattr(loaders, "STORAGE", str(tmp_path))
+    return str(tmp_path / "orders.parquet")
+
+
+def test_load_orders_matches_row_by_row(orders_storage):
+    expected = load_orders_row_by_row(orders_storage)
+
+    orders = loaders.load_orders()
+
+    pd.testing.assert_frame_equal(
+        orders.drop(columns="ordered_items"),
+        expected.drop(columns="ordered_items"),
+    )
+    assert all(
+        np.array_equal(a, b)
+        for a, b in zip(orders.ordered_items, expected.ordered_items)
+    )
+
+
+def test_prepare_orders_matches_row_by_row(orders_storage):
+    expected = load_orders_row_by_row(orders_storage)
+
+    orders = loaders.prepare_orders(
+        pd.read_parquet(orders_storage, columns=loaders.ORDER_COLUMNS)
+    )
+
+    pd.testing.assert_frame_equal(
+        orders.drop(columns="ordered_items"),
+        expected.drop(columns="ordered_items"),
+    )
+
+
+def test_storage_fingerprint_watches_feature_parquets(mocker, tmp_path):
+    for filename in loaders.FEATURE_SOURCES:
+        (tmp_path / filename).write_bytes(b"")
+    mocker.patch.object(loaders, "STORAGE", str(tmp_path))
+    fingerprint = loaders.get_storage_fingerprint()
+
+    os.utime(tmp_path / "orders.parquet", ns=(0, 0))
+
+    assert loaders.get_storage_fingerprint() != fingerprint
@@ -1,5 +1,6 @@
+import numpy as np
 from fastapi.testclient import TestClient
-from src.module_6.basket_model.exceptions.exceptions import UserNotFoundException
+from module_6.basket_model.exceptions.exceptions import UserNotFoundException
 from src.module_6.basket_model.routers.predict import router
 from fastapi import FastAPI
 
@@ -10,9 +11,11 @@ client = TestClient(app)
 
 def test_predict_user_not_found(mocker):
     request_data = {"user_id": "404"}
+    feature_store = mocker.Mock()
+    feature_store.get_features.side_effect = UserNotFoundException("User not found")
     mocker.patch(
-        "src.module_6.basket_model.dependencies.predict.feature_store.get_features", 
-        side_effect=UserNotFoundException("User not found")
+        "src.module_6.basket_model.routers.predict.reloader.current",
+        return_value=(feature_store, mocker.Mock()),
     )
 
     response = client.post("/predict", json=request_data)
@@ -20,3 +23,34 @@ def test_predict_user_not_found(mocker):
     assert response.status_code == 404
     assert response.json() == {"detail": "UserNotFoundException: Message: User not found"}
 
+
+def test_predict_batch_user_not_found(mocker):
+    request_data = {"user_ids": ["1", "404", "2"]}
+    feature_store = mocker.Mock()
+    feature_store.get_features_batch.return_value = (
+        ["1", "2"],
+        np.array([2, 1]),
+        np.zeros((3, 4)),
+    )
+    basket_model = mocker.Mock()
+    basket_model.predict.return_value = np.array([1.0, 3.0, 5.0])
+    mocker.patch(
+        "src.module_6.basket_model.routers.predict.reloader.current",
+        return_value=(feature_store, basket_model),
+    )
+
+    response = client.post("/predict/batch", json=request_data)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "predictions": [
+            {"user_id": "1", "prediction": 2.0, "detail": None},
+            {
+                "user_id": "404",
+                "prediction": None,
+                "detail": "UserNotFoundException: Message: User not found in "
+                "feature store, User Id: 404",
+            },
+            {"user_id": "2", "prediction": 5.0, "detail": None},
+        ]
+    }